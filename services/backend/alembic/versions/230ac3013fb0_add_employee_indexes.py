@@ -0,0 +1,39 @@
+"""add employee indexes
+
+Revision ID: 230ac3013fb0
+Revises: 9cef2a02ba1c
+Create Date: 2026-10-18 03:50:12.403118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '230ac3013fb0'
+down_revision = '9cef2a02ba1c'
+branch_labels = None
+depends_on = None
+
+
+# CREATE INDEX CONCURRENTLY doesn't lock table for writes, but can't run inside transaction
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_employee_department_number'), 'employee', ['department_number'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_employee_employment_date_id', 'employee', ['employment_date', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_employee_topic_id'), 'employee', ['topic_id'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_employee_post_id'), 'employee', ['post_id'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_employee_salary_id'), 'employee', ['salary_id'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_employee_title_title_id'), 'employee_title', ['title_id'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_salary_currency_id'), 'salary', ['currency_id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_salary_currency_id'), table_name='salary', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_employee_title_title_id'), table_name='employee_title', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_employee_salary_id'), table_name='employee', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_employee_post_id'), table_name='employee', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_employee_topic_id'), table_name='employee', postgresql_concurrently=True)
+        op.drop_index('ix_employee_employment_date_id', table_name='employee', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_employee_department_number'), table_name='employee', postgresql_concurrently=True)
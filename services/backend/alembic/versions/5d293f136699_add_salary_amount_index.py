@@ -0,0 +1,28 @@
+"""add salary amount index
+
+Revision ID: 5d293f136699
+Revises: 7d4181a8b7c0
+Create Date: 2026-10-18 04:47:09.126734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d293f136699'
+down_revision = '7d4181a8b7c0'
+branch_labels = None
+depends_on = None
+
+
+# Employment date ranges are served by ix_employee_employment_date_id.
+# CREATE INDEX CONCURRENTLY doesn't lock table for writes, but can't run inside transaction
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_salary_amount'), 'salary', ['amount'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_salary_amount'), table_name='salary', postgresql_concurrently=True)
@@ -0,0 +1,37 @@
+"""add currency rate table
+
+Revision ID: 77456371b0e8
+Revises: 5d293f136699
+Create Date: 2026-10-18 06:12:41.530962
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '77456371b0e8'
+down_revision = '5d293f136699'
+branch_labels = None
+depends_on = None
+
+
+# ix_salary_currency_id is covered by ix_salary_currency_id_amount, which also serves top salaries of currency
+def upgrade() -> None:
+    op.create_table('currency_rate',
+    sa.Column('currency_id', sa.Integer(), nullable=False),
+    sa.Column('rate', sa.Numeric(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['currency_id'], ['currency.id'], ),
+    sa.PrimaryKeyConstraint('currency_id')
+    )
+    with op.get_context().autocommit_block():
+        op.create_index('ix_salary_currency_id_amount', 'salary', ['currency_id', 'amount'], unique=False, postgresql_concurrently=True)
+        op.drop_index(op.f('ix_salary_currency_id'), table_name='salary', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_salary_currency_id'), 'salary', ['currency_id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_salary_currency_id_amount', table_name='salary', postgresql_concurrently=True)
+    op.drop_table('currency_rate')
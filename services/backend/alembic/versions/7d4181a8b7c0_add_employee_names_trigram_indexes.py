@@ -0,0 +1,33 @@
+"""add employee names trigram indexes
+
+Revision ID: 7d4181a8b7c0
+Revises: 230ac3013fb0
+Create Date: 2026-10-18 04:21:37.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d4181a8b7c0'
+down_revision = '230ac3013fb0'
+branch_labels = None
+depends_on = None
+
+
+# CREATE INDEX CONCURRENTLY doesn't lock table for writes, but can't run inside transaction
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_employee_name_trgm', 'employee', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}, postgresql_concurrently=True)
+        op.create_index('ix_employee_surname_trgm', 'employee', ['surname'], unique=False, postgresql_using='gin', postgresql_ops={'surname': 'gin_trgm_ops'}, postgresql_concurrently=True)
+        op.create_index('ix_employee_patronymic_trgm', 'employee', ['patronymic'], unique=False, postgresql_using='gin', postgresql_ops={'patronymic': 'gin_trgm_ops'}, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_employee_patronymic_trgm', table_name='employee', postgresql_using='gin', postgresql_ops={'patronymic': 'gin_trgm_ops'}, postgresql_concurrently=True)
+        op.drop_index('ix_employee_surname_trgm', table_name='employee', postgresql_using='gin', postgresql_ops={'surname': 'gin_trgm_ops'}, postgresql_concurrently=True)
+        op.drop_index('ix_employee_name_trgm', table_name='employee', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}, postgresql_concurrently=True)
@@ -0,0 +1,43 @@
+"""add hire count table
+
+Revision ID: aa19c56c4109
+Revises: 77456371b0e8
+Create Date: 2026-10-18 06:58:20.117304
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'aa19c56c4109'
+down_revision = '77456371b0e8'
+branch_labels = None
+depends_on = None
+
+
+# Backfill is same as database_app.service.storage.rebuild_hire_counts
+def upgrade() -> None:
+    op.create_table('hire_count',
+    sa.Column('dimension', sa.String(length=20), nullable=False),
+    sa.Column('key', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('dimension', 'key', 'year')
+    )
+    op.execute("""
+        INSERT INTO hire_count (dimension, key, year, count)
+        SELECT 'topic', topic_id, extract(year FROM employment_date)::int AS year, count(*)
+        FROM employee GROUP BY topic_id, year
+        UNION ALL
+        SELECT 'department', department_number, extract(year FROM employment_date)::int AS year, count(*)
+        FROM employee GROUP BY department_number, year
+        UNION ALL
+        SELECT 'title', employee_title.title_id, extract(year FROM employee.employment_date)::int AS year, count(*)
+        FROM employee JOIN employee_title ON employee_title.employee_id = employee.id
+        GROUP BY employee_title.title_id, year
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('hire_count')
@@ -0,0 +1,99 @@
+# Per-process caches of computed results.
+# Results are keyed with data version, which is bumped after every committed change of employees,
+# so entries computed before the change are never hit again and are evicted as least recently used.
+# Other processes don't see the bump, so TTL bounds staleness when backend runs in several workers
+
+import datetime
+import time
+import uuid
+from collections import OrderedDict
+from typing import Generic, Hashable, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .schema import CacheStats
+
+
+KT = TypeVar("KT", bound=Hashable)
+VT = TypeVar("VT")
+
+DATA_CHANGED_KEY = "data_changed"
+
+_data_version = 0
+
+# Makes data versions of different processes and process restarts distinct
+BOOT_ID = uuid.uuid4().hex[:12]
+
+
+class TTLCache(Generic[KT, VT]):
+    def __init__(self, maxsize: int, ttl: float | None = None) -> None:
+        """
+        :param ttl: Seconds entry stays valid. Entries don't expire if None
+        """
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[KT, tuple[float, VT]] = OrderedDict()
+
+    def get(self, key: KT) -> VT | None:
+        entry = self._entries.get(key)
+        if entry is None or (self.ttl is not None and time.monotonic() - entry[0] > self.ttl):
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: KT, value: VT) -> None:
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> CacheStats:
+        return CacheStats(hits=self.hits, misses=self.misses, size=len(self._entries), maxsize=self.maxsize)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def get_data_version() -> int:
+    return _data_version
+
+
+def get_data_version_etag() -> str:
+    """
+    :return: Strong ETag of responses computed from current data.
+     Tenure statistics change with current date, so date is part of it
+    """
+
+    return f'"{BOOT_ID}-{_data_version}-{datetime.date.today().isoformat()}"'
+
+
+def bump_data_version_after_commit(db: AsyncSession) -> None:
+    db.info[DATA_CHANGED_KEY] = True
+
+
+def bump_data_version() -> None:
+    global _data_version
+    _data_version += 1
+
+
+@event.listens_for(Session, "after_commit")
+def bump_data_version_if_changed(session: Session) -> None:
+    if session.info.pop(DATA_CHANGED_KEY, False):
+        bump_data_version()
+
+
+@event.listens_for(Session, "after_rollback")
+def drop_data_changed(session: Session) -> None:
+    session.info.pop(DATA_CHANGED_KEY, None)
@@ -10,11 +10,39 @@ class DatabaseSettings(BaseModel):
 class CurrencyExchangeRatesSettings(BaseModel):
     api_url: HttpUrl
     api_key: str | None
+    # Seconds after which currency rates are fetched again
+    rates_ttl: float = 3600
+    # Seconds before rates expiration when background refresh starts
+    refresh_margin: float = 300
+    snapshot_path: str = "exchange_rates_snapshot.json"
+
+
+class StorageSettings(BaseModel):
+    # Most employees created by one bulk request
+    employees_bulk_create_max_size: int = 10000
+
+
+class CacheSettings(BaseModel):
+    lookups_maxsize: int = 10000
+    search_results_maxsize: int = 1000
+    search_results_ttl: float = 60
+    forecasts_maxsize: int = 1000
+    forecasts_ttl: float = 60
+
+
+class ForecastsSettings(BaseModel):
+    # Worker processes fitting forecast models. Number of CPUs if None
+    process_pool_workers: int | None = None
+    # Series fitted by one worker task
+    chunk_size: int = 1000
 
 
 class Settings(BaseSettings):
     database: DatabaseSettings
     currency_exchange_rates: CurrencyExchangeRatesSettings
+    storage: StorageSettings = StorageSettings()
+    cache: CacheSettings = CacheSettings()
+    forecasts: ForecastsSettings = ForecastsSettings()
 
     class Config:
         env_prefix = "BACKEND__"
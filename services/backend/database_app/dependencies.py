@@ -1,8 +1,10 @@
 from typing import AsyncIterator
 
+from fastapi import Request, Response, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database_app.database import get_async_engine
+from database_app.cache import get_data_version_etag
 
 
 async def get_db() -> AsyncIterator[AsyncSession]:
@@ -13,3 +15,18 @@ async def get_db() -> AsyncIterator[AsyncSession]:
 
 async def get_db_stub() -> None:
     raise NotImplementedError
+
+
+async def check_data_version_etag(request: Request, response: Response) -> None:
+    """
+    Answer 304 without response computing if client has response of current data version, else add ETag to response
+    """
+
+    etag = get_data_version_etag()
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        client_etags = {i.strip().removeprefix("W/") for i in if_none_match.split(",")}
+        if etag in client_etags or "*" in client_etags:
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
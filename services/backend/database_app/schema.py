@@ -10,14 +10,15 @@ class Base(BaseModel):
 
 
 class ErrorInfo(Base):
-    loc: list[str | int]
+    loc: list[int | str]
     msg: str
     type: str
 
-    def __init__(self, loc: list[str], msg: str, type_: str, **kwargs: Any) -> None:
+    def __init__(self, loc: list[int | str], msg: str, type_: str | None = None, **kwargs: Any) -> None:
         # Mypy doesn't see it, but args should be passed to super().__init__, not assigned here,
-        # else pydantic.ValidationError raised
-        super().__init__(loc=loc, msg=msg, type=type_, **kwargs)  # type: ignore[call-arg]
+        # else pydantic.ValidationError raised.
+        # "type" is passed as keyword when ErrorInfo is parsed from dict, e.g. on response model validation
+        super().__init__(loc=loc, msg=msg, type=kwargs.pop("type", type_), **kwargs)  # type: ignore[call-arg]
 
 
 class ErrorResponseBody(Base):
@@ -27,3 +28,10 @@ class ErrorResponseBody(Base):
         # Mypy doesn't see it, but args should be passed to super().__init__, not assigned here,
         # else pydantic.ValidationError raised
         super().__init__(detail=detail, **kwargs)  # type: ignore[call-arg]
+
+
+class CacheStats(Base):
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
@@ -0,0 +1,225 @@
+"""
+Compare forecast models by accuracy and speed:
+
+    python -m database_app.service.forecasts.backtest backtest [--database {title,topic,department}]
+    python -m database_app.service.forecasts.backtest benchmark [--series-count 10000] [--min-throughput SERIES_PER_SECOND]
+
+Backtest replays yearly hire history, synthetic or read from database (e.g. restored from dump),
+by rolling origin: every history prefix of at least --min-history-years years is forecasted
+and compared with next --years-count years of history.
+
+Benchmark forecasts synthetic series by every model and exits with status 1
+if throughput of some model is lower than --min-throughput
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import NamedTuple, Sequence, get_args
+
+import numpy as np
+
+from ...dependencies import get_db
+from ..storage import schema as storage_schema
+from ..statistics import service as statistics_service
+from . import engine
+
+
+SINGLE_SERIES_TIMING_SAMPLE_SIZE = 1000
+
+
+class BacktestWindows(NamedTuple):
+    histories: list[dict[int, int]]
+    actuals: list[list[int]]
+
+
+class BacktestResult(NamedTuple):
+    model: engine.ForecastModel
+    windows_count: int
+    mae: float
+    # Mean absolute percentage error over actual values not equal to 0. None if all actual values are 0
+    mape: float | None
+    total_seconds: float
+    # Median of forecasting one series alone, like title forecast endpoint does
+    series_microseconds: float
+
+
+class BenchmarkResult(NamedTuple):
+    model: engine.ForecastModel
+    series_count: int
+    seconds: float
+
+    @property
+    def throughput(self) -> float:
+        return self.series_count / self.seconds
+
+
+def get_synthetic_histories(
+        series_count: int,
+        min_years: int = 3,
+        max_years: int = 25,
+        seed: int = 0,
+) -> list[dict[int, int]]:
+    """
+    :return: Noisy linear yearly series of employees counts, ending in random years of 2015-2023
+    """
+
+    rng = np.random.default_rng(seed)
+    histories = []
+    for _ in range(series_count):
+        years_count = int(rng.integers(min_years, max_years + 1))
+        last_year = int(rng.integers(2015, 2024))
+        trend = rng.uniform(1, 200) + rng.normal(0, 3) * np.arange(years_count)
+        values = np.maximum(np.round(trend + rng.normal(0, 5, years_count)), 0).astype(np.int64)
+        histories.append(dict(zip(range(last_year - years_count + 1, last_year + 1), values.tolist())))
+
+    return histories
+
+
+async def get_database_histories(dimension: storage_schema.HireCountDimension) -> list[dict[int, int]]:
+    async for db in get_db():
+        employees_growth_history = await statistics_service.get_employees_growth_history(db, dimension)
+        return list(employees_growth_history.values())
+
+    raise AssertionError("get_db yields session")
+
+
+def get_backtest_windows(
+        histories: Sequence[dict[int, int]],
+        years_count: int,
+        min_history_years: int,
+) -> BacktestWindows:
+    """
+    Split every history at every origin that leaves at least min_history_years years before it
+    and years_count years after it
+    """
+
+    windows = BacktestWindows([], [])
+    for history in histories:
+        years = sorted(history)
+        for origin in range(min_history_years, len(years) - years_count + 1):
+            windows.histories.append({year: history[year] for year in years[:origin]})
+            windows.actuals.append([history[year] for year in years[origin:origin + years_count]])
+
+    return windows
+
+
+def backtest(
+        windows: BacktestWindows,
+        years_count: int,
+        model: engine.ForecastModel,
+) -> BacktestResult:
+
+    assert windows.histories
+
+    start = time.perf_counter()
+    forecasts = engine.forecast(windows.histories, years_count, model)
+    total_seconds = time.perf_counter() - start
+
+    series_seconds = []
+    for history in windows.histories[:SINGLE_SERIES_TIMING_SAMPLE_SIZE]:
+        start = time.perf_counter()
+        engine.forecast([history], years_count, model)
+        series_seconds.append(time.perf_counter() - start)
+
+    predicted = np.array([[forecast[year] for year in sorted(forecast)] for forecast in forecasts], dtype=np.float64)
+    actual = np.array(windows.actuals, dtype=np.float64)
+    errors = np.abs(predicted - actual)
+
+    not_zero = actual != 0
+    mape = float(np.mean(errors[not_zero] / actual[not_zero]) * 100) if not_zero.any() else None
+
+    return BacktestResult(
+        model=model,
+        windows_count=len(windows.histories),
+        mae=float(np.mean(errors)),
+        mape=mape,
+        total_seconds=total_seconds,
+        series_microseconds=statistics.median(series_seconds) * 1e6,
+    )
+
+
+def benchmark(
+        histories: Sequence[dict[int, int]],
+        years_count: int,
+        model: engine.ForecastModel,
+        repeats: int = 5,
+) -> BenchmarkResult:
+    """
+    :return: Best time of repeats, so result is less affected by other load of machine
+    """
+
+    best_seconds = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        engine.forecast(histories, years_count, model)
+        best_seconds = min(best_seconds, time.perf_counter() - start)
+
+    return BenchmarkResult(model=model, series_count=len(histories), seconds=best_seconds)
+
+
+def run_backtest(args: argparse.Namespace) -> None:
+    if args.database is not None:
+        histories = asyncio.run(get_database_histories(args.database))
+    else:
+        histories = get_synthetic_histories(args.series_count, seed=args.seed)
+
+    windows = get_backtest_windows(histories, args.years_count, args.min_history_years)
+    if not windows.histories:
+        raise SystemExit(f"No history has {args.min_history_years + args.years_count} years")
+
+    print(f"{len(histories)} series, {len(windows.histories)} windows")
+    print(f"{'model':<24}{'MAE':>10}{'MAPE, %':>10}{'total, s':>12}{'series, us':>12}")
+    for model in get_args(engine.ForecastModel):
+        result = backtest(windows, args.years_count, model)
+        mape = f"{result.mape:.2f}" if result.mape is not None else "-"
+        print(
+            f"{result.model:<24}{result.mae:>10.2f}{mape:>10}"
+            f"{result.total_seconds:>12.4f}{result.series_microseconds:>12.1f}"
+        )
+
+
+def run_benchmark(args: argparse.Namespace) -> None:
+    histories = get_synthetic_histories(args.series_count, seed=args.seed)
+
+    too_slow = False
+    print(f"{'model':<24}{'seconds':>10}{'series/s':>14}")
+    for model in get_args(engine.ForecastModel):
+        result = benchmark(histories, args.years_count, model, args.repeats)
+        print(f"{result.model:<24}{result.seconds:>10.4f}{result.throughput:>14.0f}")
+        if args.min_throughput is not None and result.throughput < args.min_throughput:
+            too_slow = True
+
+    if too_slow:
+        raise SystemExit(f"Throughput is lower than {args.min_throughput:.0f} series/s")
+
+
+def get_args_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Forecast models backtesting and benchmark")
+    parser.add_argument("--years-count", type=int, default=2, help="Forecasted years")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of synthetic series")
+    commands = parser.add_subparsers(required=True)
+
+    backtest_parser = commands.add_parser("backtest", help="Accuracy and compute time of models")
+    backtest_parser.add_argument(
+        "--database",
+        choices=get_args(storage_schema.HireCountDimension),
+        help="Replay hire history of every title, topic or department from database instead of synthetic series",
+    )
+    backtest_parser.add_argument("--series-count", type=int, default=1000, help="Synthetic series count")
+    backtest_parser.add_argument("--min-history-years", type=int, default=3, help="Shortest forecasted history")
+    backtest_parser.set_defaults(command=run_backtest)
+
+    benchmark_parser = commands.add_parser("benchmark", help="Throughput of forecasting engine")
+    benchmark_parser.add_argument("--series-count", type=int, default=10000, help="Synthetic series count")
+    benchmark_parser.add_argument("--repeats", type=int, default=5)
+    benchmark_parser.add_argument("--min-throughput", type=float, help="Lowest allowed series per second")
+    benchmark_parser.set_defaults(command=run_benchmark)
+
+    return parser
+
+
+if __name__ == "__main__":
+    parsed_args = get_args_parser().parse_args()
+    parsed_args.command(parsed_args)
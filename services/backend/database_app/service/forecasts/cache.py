@@ -0,0 +1,14 @@
+# Per-process cache of forecasts.
+# Forecast depends only on hire history, so it's cached by data version, see database_app.cache
+
+from functools import lru_cache
+from typing import Hashable
+
+from ...config import get_settings
+from ...cache import TTLCache
+
+
+@lru_cache
+def get_forecasts_cache() -> TTLCache[Hashable, dict[str, dict[int, int]]]:
+    settings = get_settings().cache
+    return TTLCache(settings.forecasts_maxsize, settings.forecasts_ttl)
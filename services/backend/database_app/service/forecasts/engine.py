@@ -0,0 +1,138 @@
+from typing import Literal, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+
+ForecastModel = Literal["moving_average", "linear_trend", "exponential_smoothing"]
+
+MOVING_AVERAGE_WINDOW = 5
+SMOOTHING_LEVEL = 0.5
+
+FloatArray = npt.NDArray[np.float64]
+
+
+def get_series_matrix(histories: Sequence[dict[int, int]]) -> FloatArray:
+    """
+    :param histories: Not empty yearly series without gaps in years
+    :return: Matrix of series values, aligned by last year of each series and padded with NaN from left
+    """
+
+    width = max(len(history) for history in histories)
+    matrix = np.full((len(histories), width), np.nan)
+    for row, history in zip(matrix, histories):
+        row[width - len(history):] = [history[year] for year in sorted(history)]
+    return matrix
+
+
+def forecast_moving_average(matrix: FloatArray, years_count: int) -> FloatArray:
+    """
+    Every next value is rounded mean of up to MOVING_AVERAGE_WINDOW last values, forecasted ones included.
+    Window sums are updated by added and dropped values, so every step is O(1) per series
+    """
+
+    values = np.concatenate((matrix, np.full((matrix.shape[0], years_count), np.nan)), axis=1)
+    present = ~np.isnan(values)
+    history_width = matrix.shape[1]
+
+    window = values[:, max(history_width - MOVING_AVERAGE_WINDOW, 0):history_width]
+    window_sum = np.nansum(window, axis=1)
+    window_count = np.count_nonzero(~np.isnan(window), axis=1)
+
+    for column in range(history_width, history_width + years_count):
+        next_values = np.round(window_sum / window_count)
+        values[:, column] = next_values
+        present[:, column] = True
+
+        window_sum += next_values
+        window_count += 1
+        dropped_column = column - MOVING_AVERAGE_WINDOW
+        if dropped_column >= 0:
+            dropped = present[:, dropped_column]
+            window_sum -= np.where(dropped, values[:, dropped_column], 0)
+            window_count -= dropped
+
+    forecasts: FloatArray = values[:, history_width:]
+    return forecasts
+
+
+def forecast_linear_trend(matrix: FloatArray, years_count: int) -> FloatArray:
+    """
+    Least squares line of each series is extended to next years. Negative values are cut to 0
+    """
+
+    present = ~np.isnan(matrix)
+    x = np.broadcast_to(np.arange(matrix.shape[1], dtype=np.float64), matrix.shape)
+    count = present.sum(axis=1)
+
+    x_mean = np.where(present, x, 0).sum(axis=1) / count
+    y_mean = np.nansum(matrix, axis=1) / count
+    x_deviation = np.where(present, x - x_mean[:, None], 0)
+    y_deviation = np.where(present, matrix - y_mean[:, None], 0)
+
+    x_variance = (x_deviation ** 2).sum(axis=1)
+    # Series of one value has no trend
+    slope = np.divide(
+        (x_deviation * y_deviation).sum(axis=1),
+        x_variance,
+        out=np.zeros_like(x_variance),
+        where=x_variance > 0,
+    )
+
+    future_x = np.arange(matrix.shape[1], matrix.shape[1] + years_count, dtype=np.float64)
+    trend = y_mean[:, None] + slope[:, None] * (future_x[None, :] - x_mean[:, None])
+    forecasts: FloatArray = np.maximum(np.round(trend), 0)
+    return forecasts
+
+
+def forecast_exponential_smoothing(matrix: FloatArray, years_count: int) -> FloatArray:
+    """
+    Simple exponential smoothing, every next year is forecasted by rounded last level
+    """
+
+    level = matrix[:, 0].copy()
+    for column in range(1, matrix.shape[1]):
+        values = matrix[:, column]
+        level = np.where(np.isnan(level), values, SMOOTHING_LEVEL * values + (1 - SMOOTHING_LEVEL) * level)
+
+    return np.repeat(np.round(level)[:, None], years_count, axis=1)
+
+
+FORECASTERS = {
+    "moving_average": forecast_moving_average,
+    "linear_trend": forecast_linear_trend,
+    "exponential_smoothing": forecast_exponential_smoothing,
+}
+
+
+def forecast(
+        histories: Sequence[dict[int, int]],
+        years_count: int,
+        model: ForecastModel = "moving_average",
+) -> list[dict[int, int]]:
+    """
+    Forecast all series by one vectorized computation
+
+    :param histories: Yearly series without gaps in years
+    :return: Forecasts of next years_count years after last year of each series. Forecast of empty series is empty
+    """
+
+    assert years_count > 0
+
+    not_empty_histories = [history for history in histories if history]
+    if not not_empty_histories:
+        return [{} for _ in histories]
+
+    forecasts_matrix = FORECASTERS[model](get_series_matrix(not_empty_histories), years_count).astype(np.int64)
+
+    forecasts_rows = iter(forecasts_matrix.tolist())
+    forecasts: list[dict[int, int]] = []
+    for history in histories:
+        if not history:
+            forecasts.append({})
+            continue
+
+        last_year = max(history)
+        forecasts.append(dict(zip(range(last_year + 1, last_year + years_count + 1), next(forecasts_rows))))
+
+    return forecasts
@@ -0,0 +1,24 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from database_app.config import get_settings
+
+
+@lru_cache
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Pool of worker processes fitting forecast models out of event loop.
+    Workers are spawned, so they don't inherit event loop and database connections of server process
+    """
+
+    return ProcessPoolExecutor(
+        max_workers=get_settings().forecasts.process_pool_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def shutdown_process_pool() -> None:
+    if get_process_pool.cache_info().currsize:
+        get_process_pool().shutdown(cancel_futures=True)
+        get_process_pool.cache_clear()
@@ -1,11 +1,12 @@
 from typing import Annotated
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import APIRouter, Depends, status, Body, Path
+from fastapi import APIRouter, Depends, status, Body, Path, Query
 
 from database_app.service.storage import schema as storage_schema
-from ...dependencies import get_db_stub
-from . import service
+from ...schema import CacheStats
+from ...dependencies import get_db_stub, check_data_version_etag
+from . import service, engine
 
 
 router = APIRouter(tags=["Forecasts"], prefix="/forecasts")
@@ -26,11 +27,70 @@ router = APIRouter(tags=["Forecasts"], prefix="/forecasts")
         }
     },
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(check_data_version_etag)],
 )
 async def get_certain_title_employees_growth(
         title: Annotated[storage_schema.TitleIn, Body()],
-        years_count: Annotated[int, Path()],
+        years_count: Annotated[int, Path(gt=0, le=100)],
         db: Annotated[AsyncSession, Depends(get_db_stub)],
+        model: Annotated[engine.ForecastModel, Query()] = "moving_average",
 ) -> dict[int, int]:
-    employees_growth = await service.get_title_employees_growth(db, title, years_count)
+    """
+    Models:
+    moving_average - mean of up to 5 last years, forecasted ones included;
+    linear_trend - least squares line of history;
+    exponential_smoothing - simple exponential smoothing of history
+
+    Query budget: 1 aggregate statement
+    """
+
+    employees_growth = await service.get_title_employees_growth(db, title, years_count, model)
+    return employees_growth
+
+
+@router.get(
+    path="/employees_growth/{dimension}/{years_count}",
+    responses={
+        200: {
+            "content": {
+                "application/json": {
+                    "example": {
+                        "Engineer": {
+                            2025: 5,
+                            2024: 10
+                        }
+                    }
+                }
+            }
+        }
+    },
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(check_data_version_etag)],
+)
+async def get_employees_growth(
+        dimension: storage_schema.HireCountDimension,
+        years_count: Annotated[int, Path(gt=0, le=100)],
+        db: Annotated[AsyncSession, Depends(get_db_stub)],
+        model: Annotated[engine.ForecastModel, Query()] = "moving_average",
+) -> dict[str, dict[int, int]]:
+    """
+    Forecast of every title, topic or department, keyed by title name, topic name or department number.
+    Models are the same as of title employees growth
+
+    Query budget: 1 aggregate statement
+    """
+
+    employees_growth = await service.get_employees_growth(db, dimension, years_count, model)
     return employees_growth
+
+
+@router.get(
+    path="/cache_stats",
+    response_model=CacheStats
+)
+async def get_forecasts_cache_stats() -> CacheStats:
+    """
+    Hits and misses of per-process forecasts cache
+    """
+
+    return service.get_forecasts_cache_stats()
@@ -1,44 +1,81 @@
+import asyncio
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from database_app.config import get_settings
+from database_app.cache import get_data_version
+from database_app.schema import CacheStats
 from ..storage import schema as storage_schema
 from ..statistics import service as statistics_service
+from . import engine, pool, cache
 
 
 async def get_title_employees_growth(
         db: AsyncSession,
         title: storage_schema.TitleIn,
-        years_count: int
+        years_count: int,
+        model: engine.ForecastModel = "moving_average",
 ) -> dict[int, int]:
 
     assert years_count > 0
 
-    employees_growth_forecast: dict[int, int] = {}
-    employees_growth_history: dict[int, int] = await statistics_service.get_title_employees_growth_history(db, title)
-    if not employees_growth_history:
-        return {}
+    forecasts_cache = cache.get_forecasts_cache()
+    # Key is taken before reading, so forecasts of history read concurrent with employees change are never hit
+    cache_key = ("title", title.name, years_count, model, get_data_version())
+    forecasts = forecasts_cache.get(cache_key)
+    if forecasts is not None:
+        return forecasts[title.name]
+
+    employees_growth_history = await statistics_service.get_title_employees_growth_history(db, title)
+    employees_growth = engine.forecast([employees_growth_history], years_count, model)[0]
+    forecasts_cache.set(cache_key, {title.name: employees_growth})
+    return employees_growth
 
-    for _ in range(years_count):
-        employees_growth_info = {
-            **employees_growth_history,
-            **employees_growth_forecast
-        }
 
-        if len(employees_growth_info) < 5:
-            next_year_growth_neighbours_count = len(employees_growth_info)
-        else:
-            next_year_growth_neighbours_count = 5
+async def get_employees_growth(
+        db: AsyncSession,
+        dimension: storage_schema.HireCountDimension,
+        years_count: int,
+        model: engine.ForecastModel = "moving_average",
+) -> dict[str, dict[int, int]]:
+    """
+    Forecast growth of every title, topic or department.
+    Series are fitted in chunks by process pool workers, so event loop isn't blocked by model fitting
+
+    :return: Forecasts by title name, topic name or department number
+    """
+
+    assert years_count > 0
+
+    forecasts_cache = cache.get_forecasts_cache()
+    # All titles, topics or departments are cached as one entry
+    cache_key = (dimension, None, years_count, model, get_data_version())
+    employees_growth = forecasts_cache.get(cache_key)
+    if employees_growth is not None:
+        return employees_growth
 
-        growth_info_years = list(employees_growth_info.keys())
-        growth_info_years.sort(reverse=True)
-        neighbour_years = growth_info_years[:next_year_growth_neighbours_count]
+    employees_growth_history = await statistics_service.get_employees_growth_history(db, dimension)
+    names = list(employees_growth_history)
+    histories = list(employees_growth_history.values())
 
-        next_years_growth = 0
-        for year in neighbour_years:
-            next_years_growth += employees_growth_info[year]
+    chunk_size = get_settings().forecasts.chunk_size
+    loop = asyncio.get_running_loop()
+    chunks_forecasts = await asyncio.gather(*(
+        loop.run_in_executor(
+            pool.get_process_pool(),
+            engine.forecast,
+            histories[chunk_start:chunk_start + chunk_size],
+            years_count,
+            model,
+        )
+        for chunk_start in range(0, len(histories), chunk_size)
+    ))
 
-        next_years_growth = round(next_years_growth / next_year_growth_neighbours_count)
+    forecasts = (forecast for chunk_forecasts in chunks_forecasts for forecast in chunk_forecasts)
+    employees_growth = dict(zip(names, forecasts))
+    forecasts_cache.set(cache_key, employees_growth)
+    return employees_growth
 
-        current_max_year = max(growth_info_years)
-        employees_growth_forecast[current_max_year + 1] = next_years_growth
 
-    return employees_growth_forecast
+def get_forecasts_cache_stats() -> CacheStats:
+    return cache.get_forecasts_cache().get_stats()
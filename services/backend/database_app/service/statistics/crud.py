@@ -1,10 +1,264 @@
-from sqlalchemy import select, asc
+from typing import Collection
+
+from sqlalchemy import Select, ColumnElement, select, asc, func, literal, cast, extract, any_, and_, String, Integer, \
+    Float, union_all, true
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 
 from ..storage import models as storage_models
+from ..storage import crud as storage_crud
+from ..storage import schema as storage_schema
 
 
 async def get_work_longest_employees(db: AsyncSession, employees_count: int) -> list[storage_models.Employee]:
-    stmt = select(storage_models.Employee).order_by(asc(storage_models.Employee.employment_date)).limit(employees_count)
-    db_employees = (await db.scalars(stmt)).all()
+    stmt = select(storage_models.Employee).options(*storage_crud.EMPLOYEE_LOAD_OPTIONS).order_by(
+        asc(storage_models.Employee.employment_date)
+    ).limit(employees_count)
+    db_employees = (await db.scalars(stmt)).unique().all()
+    return list(db_employees)
+
+
+async def get_highest_paid_employees(db: AsyncSession, employees_count: int) -> list[storage_models.Employee]:
+    """
+    Employees ordered by salary in USD, computed with stored currency rates.
+    Employees with salary in currency without rate are last.
+
+    Salary in USD is ordered like salary amount within one currency, so only top employees of each currency
+    are read by salary currency and amount index, and then ranked by salary in USD
+    """
+
+    employee = storage_models.Employee
+    salary = storage_models.Salary
+    currency_top_employees = select(employee.id, salary.amount).join(
+        salary, salary.id == employee.salary_id
+    ).where(
+        salary.currency_id == storage_models.Currency.id
+    ).order_by(
+        salary.amount.desc(), employee.id
+    ).limit(employees_count).lateral("currency_top_employee")
+
+    salary_in_usd = (currency_top_employees.c.amount * storage_models.CurrencyRate.rate).label("salary_in_usd")
+    top_employees = select(currency_top_employees.c.id, salary_in_usd).select_from(storage_models.Currency).join(
+        currency_top_employees, true()
+    ).outerjoin(
+        storage_models.CurrencyRate, storage_models.CurrencyRate.currency_id == storage_models.Currency.id
+    ).order_by(
+        salary_in_usd.desc().nulls_last(), currency_top_employees.c.id
+    ).limit(employees_count).subquery("top_employee")
+
+    stmt = select(employee).options(*storage_crud.EMPLOYEE_LOAD_OPTIONS).join(
+        top_employees, top_employees.c.id == employee.id
+    ).order_by(
+        top_employees.c.salary_in_usd.desc().nulls_last(), employee.id
+    )
+    db_employees = (await db.scalars(stmt)).unique().all()
     return list(db_employees)
+
+
+async def get_employees_growth_history(
+        db: AsyncSession,
+        dimension: storage_schema.HireCountDimension,
+        names: Collection[str] | None = None,
+) -> list[tuple[str, int, int]]:
+    """
+    Count employees of each title, topic or department employed in each year,
+    years between first and last employment included.
+    Counts are read from hire_count summary rows
+
+    :param names: Names of titles or topics, or department numbers to count. All are counted if None
+    :return: (name, year, employees count) rows ordered by name and year, departments by number and year.
+     There are no rows of titles, topics and departments without employees
+    """
+
+    hire_count = storage_models.HireCount
+    name: ColumnElement[str] | InstrumentedAttribute[str]
+    if dimension == "title":
+        name = storage_models.Title.name
+        years_counts_stmt = select(hire_count.key, name, hire_count.year, hire_count.count).join(
+            storage_models.Title, storage_models.Title.id == hire_count.key
+        )
+    elif dimension == "topic":
+        name = storage_models.Topic.name
+        years_counts_stmt = select(hire_count.key, name, hire_count.year, hire_count.count).join(
+            storage_models.Topic, storage_models.Topic.id == hire_count.key
+        )
+    else:
+        name = cast(hire_count.key, String)
+        # Without label cast column gets name of key column and CTE refers to key column instead of it
+        years_counts_stmt = select(hire_count.key, name.label("name"), hire_count.year, hire_count.count)
+
+    years_counts_stmt = years_counts_stmt.where(hire_count.dimension == dimension, hire_count.count > 0)
+    if names is not None:
+        years_counts_stmt = years_counts_stmt.where(name == any_(literal(list(names), ARRAY(String))))
+    years_counts = years_counts_stmt.cte("employees_count")
+    key_column, name_column, year_column, count_column = years_counts.c
+
+    years_bounds = select(
+        key_column.label("key"),
+        name_column.label("name"),
+        func.min(year_column).label("min_year"),
+        func.max(year_column).label("max_year"),
+    ).group_by(key_column, name_column).cte("years_bounds")
+
+    # Function in FROM may refer to preceding FROM items
+    years = func.generate_series(
+        years_bounds.c.min_year, years_bounds.c.max_year
+    ).table_valued(  # type: ignore[no-untyped-call]
+        "value", name="year", joins_implicitly=True
+    ).render_derived()
+
+    stmt: Select[tuple[str, int, int]] = select(
+        years_bounds.c.name, years.c.value, func.coalesce(count_column, 0)
+    ).select_from(years_bounds).join(years, true()).outerjoin(
+        years_counts, and_(key_column == years_bounds.c.key, year_column == years.c.value)
+    ).order_by(
+        # Department number is ordered as number, not as string
+        years_bounds.c.key if dimension == "department" else years_bounds.c.name,
+        years.c.value,
+    )
+    return list((await db.execute(stmt)).tuples().all())
+
+
+async def get_titles_employees_growth_history(
+        db: AsyncSession,
+        titles_names: Collection[str],
+) -> list[tuple[str, int, int]]:
+    """
+    :return: (title name, year, employees count) rows ordered by title name and year
+    """
+
+    return await get_employees_growth_history(db, "title", titles_names)
+
+
+async def get_title_employees_growth_history(db: AsyncSession, title_name: str) -> list[tuple[int, int]]:
+    """
+    :return: (year, employees count) rows ordered by year
+    """
+
+    titles_growth_history = await get_titles_employees_growth_history(db, [title_name])
+    return [(year, employees_count) for _, year, employees_count in titles_growth_history]
+
+
+async def get_facets(
+        db: AsyncSession,
+        search_model: storage_schema.EmployeeSearchModel | None = None,
+) -> list[tuple[str, str, int]]:
+    """
+    Count employees per title, topic, post, department and currency by one statement
+
+    :return: (facet, key, employees count) rows
+    """
+
+    employee = storage_models.Employee
+    filters = storage_crud.get_employees_search_filters(search_model) if search_model is not None else []
+    filtered = select(
+        employee.id,
+        employee.topic_id,
+        employee.post_id,
+        employee.salary_id,
+        employee.department_number,
+    ).where(*filters).cte("filtered_employee")
+
+    employee_title = storage_models.employee_title_table
+    titles: Select[tuple[str, str, int]] = select(
+        literal("titles", String).label("facet"), storage_models.Title.name.label("key"), func.count().label("count")
+    ).select_from(filtered).join(
+        employee_title, employee_title.c.employee_id == filtered.c.id
+    ).join(
+        storage_models.Title, storage_models.Title.id == employee_title.c.title_id
+    ).group_by(storage_models.Title.name)
+
+    topics: Select[tuple[str, str, int]] = select(
+        literal("topics", String), storage_models.Topic.name, func.count()
+    ).select_from(filtered).join(
+        storage_models.Topic, storage_models.Topic.id == filtered.c.topic_id
+    ).group_by(storage_models.Topic.name)
+
+    posts: Select[tuple[str, str, int]] = select(
+        literal("posts", String), storage_models.Post.name, func.count()
+    ).select_from(filtered).join(
+        storage_models.Post, storage_models.Post.id == filtered.c.post_id
+    ).group_by(storage_models.Post.name)
+
+    departments: Select[tuple[str, str, int]] = select(
+        literal("departments", String), cast(filtered.c.department_number, String), func.count()
+    ).select_from(filtered).group_by(filtered.c.department_number)
+
+    currencies: Select[tuple[str, str, int]] = select(
+        literal("currencies", String), storage_models.Currency.name, func.count()
+    ).select_from(filtered).join(
+        storage_models.Salary, storage_models.Salary.id == filtered.c.salary_id
+    ).join(
+        storage_models.Currency, storage_models.Currency.id == storage_models.Salary.currency_id
+    ).group_by(storage_models.Currency.name)
+
+    stmt = union_all(titles, topics, posts, departments, currencies)
+    rows = (await db.execute(stmt)).tuples().all()
+    return list(rows)
+
+
+def get_tenure_months() -> ColumnElement[int]:
+    """
+    :return: Full months employee works, same as relativedelta years * 12 + months
+    """
+
+    tenure = func.age(func.current_date(), storage_models.Employee.employment_date)
+    return (extract("year", tenure) * 12 + extract("month", tenure)).cast(Integer)
+
+
+def get_tenure_filters(department_number: int | None, title_name: str | None) -> list[ColumnElement[bool]]:
+    filters = []
+    if department_number is not None:
+        filters.append(storage_models.Employee.department_number == department_number)
+    if title_name is not None:
+        filters.append(storage_models.Employee.titles.any(storage_models.Title.name == title_name))
+    return filters
+
+
+async def get_tenure_histogram(
+        db: AsyncSession,
+        buckets_count: int,
+        department_number: int | None = None,
+        title_name: str | None = None,
+) -> list[tuple[int, int, int, int]]:
+    """
+    Split range of employees tenures to buckets of equal width
+
+    :return: (bucket number from 1, employees count, min tenure, max tenure) rows of not empty buckets
+    """
+
+    tenures = select(
+        get_tenure_months().label("months")
+    ).where(*get_tenure_filters(department_number, title_name)).cte("tenure")
+    bounds = select(
+        func.min(tenures.c.months).label("min_months"), func.max(tenures.c.months).label("max_months")
+    ).cte("tenure_bounds")
+
+    # Upper bound is exclusive for width_bucket, so max tenure is in last bucket
+    bucket = func.width_bucket(tenures.c.months, bounds.c.min_months, bounds.c.max_months + 1, buckets_count)
+    stmt: Select[tuple[int, int, int, int]] = select(
+        bucket, func.count(), bounds.c.min_months, bounds.c.max_months
+    ).select_from(tenures).join(bounds, true()).group_by(
+        bucket, bounds.c.min_months, bounds.c.max_months
+    ).order_by(bucket)
+    return list((await db.execute(stmt)).tuples().all())
+
+
+async def get_tenure_percentiles(
+        db: AsyncSession,
+        percentiles: list[float],
+        department_number: int | None = None,
+        title_name: str | None = None,
+) -> list[float] | None:
+    """
+    :return: Continuous tenure percentiles in months, None if there are no employees
+    """
+
+    stmt = select(
+        func.percentile_cont(literal(percentiles, ARRAY(Float))).within_group(  # type: ignore[no-untyped-call]
+            get_tenure_months()
+        )
+    ).where(*get_tenure_filters(department_number, title_name))
+    tenure_percentiles: list[float] | None = await db.scalar(stmt)
+    return tenure_percentiles
@@ -1,11 +1,12 @@
 from typing import Annotated
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import APIRouter, Depends, status, Path, Body
+from fastapi import APIRouter, Depends, status, Path, Body, Query
 
 from database_app.service.storage import schema as storage_schema
-from ...dependencies import get_db_stub
+from ...dependencies import get_db_stub, check_data_version_etag
 from . import service
+from . import schema
 
 router = APIRouter(tags=["Statistics"], prefix="/statistics")
 
@@ -14,11 +15,17 @@ router = APIRouter(tags=["Statistics"], prefix="/statistics")
     path="/highest_paid_employees/{employees_count}",
     response_model=list[storage_schema.EmployeeOut],
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(check_data_version_etag)],
 )
 async def get_highest_paid_employees(
         employees_count: Annotated[int, Path()],
         db: Annotated[AsyncSession, Depends(get_db_stub)],
 ) -> list[storage_schema.Employee]:
+    """
+    Query budget: 2 statements regardless of employees count (relations joined, titles selected by IN).
+    Salaries are converted by currency rates stored after every exchange rates refresh
+    """
+
     employees = await service.get_highest_paid_employees(db, employees_count)
     return employees
 
@@ -27,11 +34,16 @@ async def get_highest_paid_employees(
     path="/work_longest_employees/{employees_count}",
     response_model=list[storage_schema.EmployeeOut],
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(check_data_version_etag)],
 )
 async def get_work_longest_employees(
         employees_count: Annotated[int, Path()],
         db: Annotated[AsyncSession, Depends(get_db_stub)],
 ) -> list[storage_schema.Employee]:
+    """
+    Query budget: 2 statements regardless of employees count (relations joined, titles selected by IN)
+    """
+
     employees = await service.get_work_longest_employee(db, employees_count)
     return employees
 
@@ -51,10 +63,99 @@ async def get_work_longest_employees(
         }
     },
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(check_data_version_etag)],
 )
 async def get_title_employees_growth(
         title: Annotated[storage_schema.TitleIn, Body()],
         db: Annotated[AsyncSession, Depends(get_db_stub)],
 ) -> dict[int, int]:
+    """
+    Query budget: 1 aggregate statement
+    """
+
     employees_growth = await service.get_title_employees_growth_history(db, title)
     return employees_growth
+
+
+@router.post(
+    path="/facets",
+    response_model=schema.Facets,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(check_data_version_etag)],
+)
+async def get_facets(
+        db: Annotated[AsyncSession, Depends(get_db_stub)],
+        search_model: Annotated[storage_schema.EmployeeSearchModel | None, Body()] = None,
+) -> schema.Facets:
+    """
+    Employees counts per title, topic, post, department and currency,
+    optionally only of employees matched by search model
+
+    Query budget: 1 statement
+    """
+
+    facets = await service.get_facets(db, search_model)
+    return facets
+
+
+@router.get(
+    path="/tenure_histogram",
+    response_model=schema.TenureHistogram,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(check_data_version_etag)],
+)
+async def get_tenure_histogram(
+        db: Annotated[AsyncSession, Depends(get_db_stub)],
+        buckets_count: Annotated[int, Query(ge=1, le=1000)] = 10,
+        department_number: Annotated[int | None, Query()] = None,
+        title: Annotated[str | None, Query(min_length=2, max_length=200)] = None,
+) -> schema.TenureHistogram:
+    """
+    Employees counts by months of work, split to buckets of equal width
+
+    Query budget: 1 aggregate statement
+    """
+
+    histogram = await service.get_tenure_histogram(db, buckets_count, department_number, title)
+    return histogram
+
+
+@router.get(
+    path="/tenure_percentiles",
+    response_model=schema.TenurePercentiles,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(check_data_version_etag)],
+)
+async def get_tenure_percentiles(
+        db: Annotated[AsyncSession, Depends(get_db_stub)],
+        department_number: Annotated[int | None, Query()] = None,
+        title: Annotated[str | None, Query(min_length=2, max_length=200)] = None,
+) -> schema.TenurePercentiles:
+    """
+    Months of work percentiles
+
+    Query budget: 1 aggregate statement
+    """
+
+    percentiles = await service.get_tenure_percentiles(db, department_number, title)
+    return percentiles
+
+
+@router.post(
+    path="/batch",
+    response_model=schema.StatisticsBatch,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(check_data_version_etag)],
+)
+async def get_statistics_batch(
+        batch_in: Annotated[schema.StatisticsBatchIn, Body()],
+        db: Annotated[AsyncSession, Depends(get_db_stub)],
+) -> schema.StatisticsBatch:
+    """
+    Several reports computed on one database snapshot, in order of requested reports
+
+    Query budget: sum of requested reports budgets, growth history of all titles is 1 statement
+    """
+
+    batch = await service.get_statistics_batch(db, batch_in)
+    return batch
@@ -0,0 +1,120 @@
+from typing import Annotated, Literal
+
+from pydantic import BaseModel, Field
+
+from ..storage import schema as storage_schema
+
+
+class Base(BaseModel, frozen=True):
+    pass
+
+
+class Facets(Base):
+    titles: dict[str, int]
+    topics: dict[str, int]
+    posts: dict[str, int]
+    departments: dict[int, int]
+    currencies: dict[str, int]
+
+
+class TenureBucket(Base):
+    # Months of work, max is exclusive
+    min_months: float
+    max_months: float
+    employees_count: int
+
+
+class TenureHistogram(Base):
+    buckets: list[TenureBucket]
+
+
+class TenurePercentiles(Base):
+    # Months of work, None if there are no employees
+    p50: float | None
+    p90: float | None
+    p99: float | None
+
+
+class WorkLongestEmployeesReportIn(Base):
+    type: Literal["work_longest_employees"]
+    employees_count: int = Field(ge=0)
+
+
+class HighestPaidEmployeesReportIn(Base):
+    type: Literal["highest_paid_employees"]
+    employees_count: int = Field(ge=0)
+
+
+class TitlesGrowthHistoryReportIn(Base):
+    type: Literal["titles_growth_history"]
+    titles: list[storage_schema.TitleIn]
+
+
+class FacetsReportIn(Base):
+    type: Literal["facets"]
+    search_model: storage_schema.EmployeeSearchModel | None = None
+
+
+class TenureHistogramReportIn(Base):
+    type: Literal["tenure_histogram"]
+    buckets_count: int = Field(default=10, ge=1, le=1000)
+    department_number: int | None = None
+    title: storage_schema.TitleIn | None = None
+
+
+class TenurePercentilesReportIn(Base):
+    type: Literal["tenure_percentiles"]
+    department_number: int | None = None
+    title: storage_schema.TitleIn | None = None
+
+
+ReportIn = Annotated[
+    WorkLongestEmployeesReportIn
+    | HighestPaidEmployeesReportIn
+    | TitlesGrowthHistoryReportIn
+    | FacetsReportIn
+    | TenureHistogramReportIn
+    | TenurePercentilesReportIn,
+    Field(discriminator="type")
+]
+
+
+class StatisticsBatchIn(Base):
+    reports: list[ReportIn] = Field(max_items=100)
+
+
+class EmployeesReport(Base):
+    type: Literal["work_longest_employees", "highest_paid_employees"]
+    employees: list[storage_schema.Employee]
+
+
+class TitlesGrowthHistoryReport(Base):
+    type: Literal["titles_growth_history"]
+    # Growth history by title name
+    titles: dict[str, dict[int, int]]
+
+
+class FacetsReport(Base):
+    type: Literal["facets"]
+    facets: Facets
+
+
+class TenureHistogramReport(Base):
+    type: Literal["tenure_histogram"]
+    histogram: TenureHistogram
+
+
+class TenurePercentilesReport(Base):
+    type: Literal["tenure_percentiles"]
+    percentiles: TenurePercentiles
+
+
+Report = Annotated[
+    EmployeesReport | TitlesGrowthHistoryReport | FacetsReport | TenureHistogramReport | TenurePercentilesReport,
+    Field(discriminator="type")
+]
+
+
+class StatisticsBatch(Base):
+    # Reports in order of requested reports
+    reports: list[Report]
@@ -1,24 +1,14 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.util import immutabledict
 
 from ..storage import schema as storage_schema
-from ..storage import utils as storage_utils
-from ..storage import service as storage_service
 from . import crud
+from . import schema
 
 
 async def get_highest_paid_employees(db: AsyncSession, employees_count: int) -> list[storage_schema.Employee]:
-    employees = await storage_service.get_all_employees(db)
-
-    employees_with_usd_salaries = []
-    for emp in employees:
-        employee_salary_currency_course_to_usd = await storage_utils.get_currency_course(
-            emp.salary.currency.name,
-            "USD",
-        )
-        employees_with_usd_salaries.append((emp, emp.salary.amount * employee_salary_currency_course_to_usd))
-
-    employees_with_usd_salaries.sort(key=lambda entry: entry[1], reverse=True)
-    return [storage_schema.Employee.from_orm(i[0]) for i in employees_with_usd_salaries[:employees_count]]
+    db_employees = await crud.get_highest_paid_employees(db, employees_count)
+    return [storage_schema.Employee.from_orm(i) for i in db_employees]
 
 
 async def get_work_longest_employee(db: AsyncSession, employees_count: int) -> list[storage_schema.Employee]:
@@ -28,28 +18,137 @@ async def get_work_longest_employee(db: AsyncSession, employees_count: int) -> l
     return [storage_schema.Employee.from_orm(i) for i in db_employees]
 
 
+async def get_titles_employees_growth_history(
+        db: AsyncSession,
+        titles: list[storage_schema.TitleIn]
+) -> dict[str, dict[int, int]]:
+
+    titles_employees_growth: dict[str, dict[int, int]] = {title.name: {} for title in titles}
+    for title_name, year, employees_count in await crud.get_titles_employees_growth_history(
+            db,
+            titles_employees_growth.keys()
+    ):
+        titles_employees_growth[title_name][year] = employees_count
+
+    return titles_employees_growth
+
+
+async def get_employees_growth_history(
+        db: AsyncSession,
+        dimension: storage_schema.HireCountDimension,
+) -> dict[str, dict[int, int]]:
+
+    employees_growth: dict[str, dict[int, int]] = {}
+    for name, year, employees_count in await crud.get_employees_growth_history(db, dimension):
+        employees_growth.setdefault(name, {})[year] = employees_count
+
+    return employees_growth
+
+
 async def get_title_employees_growth_history(
         db: AsyncSession,
         title: storage_schema.TitleIn
 ) -> dict[int, int]:
 
-    title_employees_growth = {}
-    title_employees = await storage_service.get_employees_by_title(db, title)
+    title_employees_growth = await crud.get_title_employees_growth_history(db, title.name)
+    return dict(title_employees_growth)
+
+
+async def get_facets(
+        db: AsyncSession,
+        search_model: storage_schema.EmployeeSearchModel | None = None,
+) -> schema.Facets:
+    facets: dict[str, dict[str, int]] = {
+        "titles": {},
+        "topics": {},
+        "posts": {},
+        "departments": {},
+        "currencies": {},
+    }
+    for facet, key, count in await crud.get_facets(db, search_model):
+        facets[facet][key] = count
+
+    return schema.Facets.parse_obj(facets)
+
+
+def get_title_name(title: str | None) -> str | None:
+    return storage_schema.TitleIn(name=title).name if title is not None else None
+
+
+async def get_tenure_histogram(
+        db: AsyncSession,
+        buckets_count: int,
+        department_number: int | None = None,
+        title: str | None = None,
+) -> schema.TenureHistogram:
+    buckets_rows = await crud.get_tenure_histogram(db, buckets_count, department_number, get_title_name(title))
+    if not buckets_rows:
+        return schema.TenureHistogram(buckets=[])
+
+    _, _, min_months, max_months = buckets_rows[0]
+    bucket_width = (max_months + 1 - min_months) / buckets_count
+    employees_counts = {bucket: employees_count for bucket, employees_count, _, _ in buckets_rows}
+
+    return schema.TenureHistogram(buckets=[
+        schema.TenureBucket(
+            min_months=min_months + bucket_width * i,
+            max_months=min_months + bucket_width * (i + 1),
+            employees_count=employees_counts.get(i + 1, 0),
+        )
+        for i in range(buckets_count)
+    ])
+
+
+async def get_tenure_percentiles(
+        db: AsyncSession,
+        department_number: int | None = None,
+        title: str | None = None,
+) -> schema.TenurePercentiles:
+    percentiles = await crud.get_tenure_percentiles(db, [0.5, 0.9, 0.99], department_number, get_title_name(title))
+    if percentiles is None:
+        return schema.TenurePercentiles(p50=None, p90=None, p99=None)
+
+    p50, p90, p99 = percentiles
+    return schema.TenurePercentiles(p50=p50, p90=p90, p99=p99)
+
 
-    if not title_employees:
-        return {}
+async def get_report(db: AsyncSession, report_in: schema.ReportIn) -> schema.Report:
+    match report_in:
+        case schema.WorkLongestEmployeesReportIn():
+            employees = await get_work_longest_employee(db, report_in.employees_count)
+            return schema.EmployeesReport(type=report_in.type, employees=employees)
+        case schema.HighestPaidEmployeesReportIn():
+            db_employees = await crud.get_highest_paid_employees(db, report_in.employees_count)
+            employees = [storage_schema.Employee.from_orm(i) for i in db_employees]
+            return schema.EmployeesReport(type=report_in.type, employees=employees)
+        case schema.TitlesGrowthHistoryReportIn():
+            titles = await get_titles_employees_growth_history(db, report_in.titles)
+            return schema.TitlesGrowthHistoryReport(type=report_in.type, titles=titles)
+        case schema.FacetsReportIn():
+            facets = await get_facets(db, report_in.search_model)
+            return schema.FacetsReport(type=report_in.type, facets=facets)
+        case schema.TenureHistogramReportIn():
+            title = report_in.title.name if report_in.title is not None else None
+            histogram = await get_tenure_histogram(db, report_in.buckets_count, report_in.department_number, title)
+            return schema.TenureHistogramReport(type=report_in.type, histogram=histogram)
+        case schema.TenurePercentilesReportIn():
+            title = report_in.title.name if report_in.title is not None else None
+            percentiles = await get_tenure_percentiles(db, report_in.department_number, title)
+            return schema.TenurePercentilesReport(type=report_in.type, percentiles=percentiles)
 
-    for emp in title_employees:
-        if emp.employment_date.year not in title_employees_growth:
-            title_employees_growth[emp.employment_date.year] = 1
-        else:
-            title_employees_growth[emp.employment_date.year] += 1
 
-    min_year = min(title_employees_growth)
-    max_year = max(title_employees_growth)
+async def get_statistics_batch(db: AsyncSession, batch_in: schema.StatisticsBatchIn) -> schema.StatisticsBatch:
+    """
+    Compute reports in one read only REPEATABLE READ transaction, so all of them see same data.
+    AsyncSession connection runs one statement at a time, so reports are computed one by one
+    """
 
-    for year in range(min_year + 1, max_year + 1):
-        if year not in title_employees_growth:
-            title_employees_growth[year] = 0
+    # Snapshot isolation can be set only on transaction begin
+    await db.commit()
+    await db.connection(
+        execution_options=immutabledict({"isolation_level": "REPEATABLE READ", "postgresql_readonly": True})
+    )
 
-    return title_employees_growth
+    reports = [await get_report(db, report_in) for report_in in batch_in.reports]
+    await db.commit()
+    return schema.StatisticsBatch(reports=reports)
@@ -0,0 +1,93 @@
+# Per-process cache of lookup rows IDs (topics, posts, titles, currencies, salaries).
+# Lookup rows are never updated or deleted by backend, so cached ID stays valid while row exists.
+# Rows inserted by transaction become visible in cache only after this transaction commits.
+# Search results are cached by data version, see database_app.cache
+
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Generic, Hashable, Iterable, Mapping, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ...config import get_settings
+from ...cache import TTLCache
+from . import schema
+
+
+KT = TypeVar("KT", bound=Hashable)
+
+PENDING_LOOKUPS_IDS_KEY = "pending_lookups_ids"
+
+
+class LookupCache(Generic[KT]):
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._ids: OrderedDict[KT, int] = OrderedDict()
+
+    def get_many(self, keys: Iterable[KT]) -> dict[KT, int]:
+        ids = {}
+        for key in keys:
+            id_ = self._ids.get(key)
+            if id_ is not None:
+                self._ids.move_to_end(key)
+                ids[key] = id_
+        return ids
+
+    def update(self, ids: Mapping[KT, int]) -> None:
+        for key, id_ in ids.items():
+            self._ids[key] = id_
+            self._ids.move_to_end(key)
+
+        while len(self._ids) > self.maxsize:
+            self._ids.popitem(last=False)
+
+    def clear(self) -> None:
+        self._ids.clear()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class LookupsCache:
+    def __init__(self, maxsize: int) -> None:
+        self.topics: LookupCache[schema.TopicIn] = LookupCache(maxsize)
+        self.posts: LookupCache[schema.PostIn] = LookupCache(maxsize)
+        self.titles: LookupCache[schema.TitleIn] = LookupCache(maxsize)
+        self.currencies: LookupCache[schema.CurrencyIn] = LookupCache(maxsize)
+        self.salaries: LookupCache[schema.SalaryIn] = LookupCache(maxsize)
+
+    def clear(self) -> None:
+        self.topics.clear()
+        self.posts.clear()
+        self.titles.clear()
+        self.currencies.clear()
+        self.salaries.clear()
+
+
+@lru_cache
+def get_lookups_cache() -> LookupsCache:
+    return LookupsCache(get_settings().cache.lookups_maxsize)
+
+
+@lru_cache
+def get_search_results_cache() -> TTLCache[Hashable, schema.EmployeesSearchPage]:
+    settings = get_settings().cache
+    return TTLCache(settings.search_results_maxsize, settings.search_results_ttl)
+
+
+def update_after_commit(db: AsyncSession, lookup_cache: LookupCache[Any], ids: Mapping[Any, int]) -> None:
+    if ids:
+        db.info.setdefault(PENDING_LOOKUPS_IDS_KEY, []).append((lookup_cache, dict(ids)))
+
+
+@event.listens_for(Session, "after_commit")
+def publish_pending_lookups_ids(session: Session) -> None:
+    for lookup_cache, ids in session.info.pop(PENDING_LOOKUPS_IDS_KEY, []):
+        lookup_cache.update(ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def drop_pending_lookups_ids(session: Session) -> None:
+    session.info.pop(PENDING_LOOKUPS_IDS_KEY, None)
@@ -0,0 +1,160 @@
+"""
+Check by EXPLAIN that main queries use indexes:
+
+    python -m database_app.service.storage.check_indexes [--require-trigram]
+
+Statements run by crud functions are recorded and explained in the same transaction with sequential scans
+disabled, so check depends on whether index can serve query, not on tables size.
+Exits with status 1 if some query doesn't use expected index.
+Trigram indexes checks are skipped if pg_trgm extension isn't installed, or fail with --require-trigram
+"""
+
+import argparse
+import asyncio
+import datetime
+from typing import Any, Awaitable, Callable, NamedTuple, Sequence
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...database import get_async_engine
+from ...dependencies import get_db
+from ..statistics import crud as statistics_crud
+from . import crud, schema
+
+
+class IndexCheck(NamedTuple):
+    description: str
+    index_name: str
+    run: Callable[[AsyncSession], Awaitable[Any]]
+    needs_trigram: bool = False
+
+
+def get_search_model(**fields: Any) -> schema.EmployeeSearchModel:
+    return schema.EmployeeSearchModel(topic=None, post=None, salary=None, titles=None, **fields)
+
+
+def get_surname_search_check(name_match: schema.NameMatchMode) -> IndexCheck:
+    return IndexCheck(
+        f"search by {name_match} surname",
+        "ix_employee_surname_trgm",
+        lambda db: crud.count_employees(db, get_search_model(surname="Petrov", name_match=name_match)),
+        needs_trigram=True,
+    )
+
+
+INDEX_CHECKS = (
+    IndexCheck(
+        "work longest employees",
+        "ix_employee_employment_date_id",
+        lambda db: statistics_crud.get_work_longest_employees(db, 10),
+    ),
+    IndexCheck(
+        "employees page by employment date",
+        "ix_employee_employment_date_id",
+        lambda db: crud.get_employees(db, 10, "employment_date", (datetime.date(2000, 1, 1), 0)),
+    ),
+    IndexCheck(
+        "highest paid employees",
+        "ix_salary_currency_id_amount",
+        lambda db: statistics_crud.get_highest_paid_employees(db, 10),
+    ),
+    IndexCheck(
+        "employees of title",
+        "ix_employee_title_title_id",
+        lambda db: crud.get_employees_by_title(db, schema.TitleIn(name="Doctor")),
+    ),
+    IndexCheck(
+        "search by department",
+        "ix_employee_department_number",
+        lambda db: crud.count_employees(db, get_search_model(department_number=1)),
+    ),
+    IndexCheck(
+        "search by employment dates range",
+        "ix_employee_employment_date_id",
+        lambda db: crud.count_employees(db, get_search_model(
+            employment_date_min=datetime.date(2000, 1, 1),
+            employment_date_max=datetime.date(2001, 1, 1),
+        )),
+    ),
+    IndexCheck(
+        "search by topic",
+        "ix_employee_topic_id",
+        lambda db: crud.count_employees(db, schema.EmployeeSearchModel(
+            topic=schema.TopicSearchModel(name="Physics"), post=None, salary=None, titles=None
+        )),
+    ),
+    get_surname_search_check("exact"),
+    get_surname_search_check("prefix"),
+    get_surname_search_check("fuzzy"),
+)
+
+
+def get_plan_indexes_names(plan: dict[str, Any]) -> set[str]:
+    indexes_names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for subplan in plan.get("Plans", []):
+        indexes_names |= get_plan_indexes_names(subplan)
+    return indexes_names
+
+
+async def get_used_indexes_names(db: AsyncSession, run: Callable[[AsyncSession], Awaitable[Any]]) -> set[str]:
+    statements: list[tuple[str, Sequence[Any]]] = []
+
+    def record_statement(
+            conn: Any, cursor: Any, statement: str, parameters: Sequence[Any], context: Any, executemany: bool
+    ) -> None:
+        statements.append((statement, parameters))
+
+    sync_engine = get_async_engine().sync_engine
+    event.listen(sync_engine, "before_cursor_execute", record_statement)
+    try:
+        await run(db)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record_statement)
+
+    connection = await db.connection()
+    indexes_names: set[str] = set()
+    for statement, parameters in statements:
+        result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", tuple(parameters))
+        plan, = result.scalar_one()
+        indexes_names |= get_plan_indexes_names(plan["Plan"])
+    return indexes_names
+
+
+async def check_indexes(require_trigram: bool = False) -> bool:
+    """
+    :return: True if all not skipped checks passed
+    """
+
+    passed = True
+    async for db in get_db():
+        has_trigram = bool(await db.scalar(text("SELECT count(*) FROM pg_extension WHERE extname = 'pg_trgm'")))
+
+        for check in INDEX_CHECKS:
+            if check.needs_trigram and not has_trigram:
+                if require_trigram:
+                    passed = False
+                    print(f"FAILED  {check.description}: pg_trgm isn't installed")
+                    continue
+                print(f"skipped {check.description}: pg_trgm isn't installed")
+                continue
+
+            await db.execute(text("SET LOCAL enable_seqscan = off"))
+            indexes_names = await get_used_indexes_names(db, check.run)
+            await db.rollback()
+
+            if check.index_name in indexes_names:
+                print(f"ok      {check.description}: {check.index_name}")
+            else:
+                passed = False
+                print(f"FAILED  {check.description}: {check.index_name} isn't used, used {sorted(indexes_names)}")
+
+    return passed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that main queries use indexes")
+    parser.add_argument("--require-trigram", action="store_true", help="Fail trigram checks instead of skipping them")
+    parsed_args = parser.parse_args()
+    if not asyncio.run(check_indexes(parsed_args.require_trigram)):
+        raise SystemExit(1)
@@ -1,102 +1,471 @@
+import datetime
 import decimal
+from collections import Counter, defaultdict
+from typing import Any, AsyncIterator, Collection, Sequence, TypeVar, cast
 
-from sqlalchemy import select, asc
+from sqlalchemy import select, insert, delete, exists, tuple_, and_, func, asc, any_, literal, extract, String, \
+    Integer, Numeric, Float, Table, ColumnElement
+from sqlalchemy.dialects.postgresql import ARRAY, Insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, joinedload, selectinload, with_expression
 
 from . import schema
 from . import models
+from . import exceptions
+from . import cache
+from . import utils
+from ...database import DBModelBase
+from ...cache import bump_data_version_after_commit
+
+
+# Keep multi-row INSERT parameters count far below PostgreSQL limit of 32767
+EMPLOYEE_TITLE_INSERT_CHUNK_SIZE = 1000
+HIRE_COUNT_UPSERT_CHUNK_SIZE = 1000
+
+# Loads everything needed for schema.Employee with 2 statements: employees with joined many-to-one
+# relations and titles of all loaded employees
+EMPLOYEE_LOAD_OPTIONS = (
+    joinedload(models.Employee.topic),
+    joinedload(models.Employee.post),
+    joinedload(models.Employee.salary).joinedload(models.Salary.currency),
+    selectinload(models.Employee.titles),
+)
+
+# Employee ID is last sort column of every key to make order unique
+EMPLOYEES_SORT_COLUMNS: dict[str, tuple[InstrumentedAttribute[Any], ...]] = {
+    "id": (models.Employee.id,),
+    "employment_date": (models.Employee.employment_date, models.Employee.id),
+}
+
+LookupInT = TypeVar("LookupInT", schema.TopicIn, schema.PostIn, schema.TitleIn, schema.CurrencyIn)
+
+
+def insert_on_conflict_do_nothing(model: type[DBModelBase]) -> Insert:
+    # Insert constructor used instead of untyped sqlalchemy.dialects.postgresql.insert.
+    # Core table is used, because ORM bulk insert doesn't support RETURNING of arbitrary columns
+    return Insert(cast(Table, model.__table__)).on_conflict_do_nothing()
 
 
 async def is_employee_id_exist(db: AsyncSession, employee_id: int) -> bool:
-    db_employee = await db.get(models.Employee, employee_id)
-    return bool(db_employee)
+    stmt = select(exists().where(models.Employee.id == employee_id))
+    return bool(await db.scalar(stmt))
 
 
 async def is_service_number_occupied(db: AsyncSession, service_number: int) -> bool:
-    stmt = select(models.Employee).where(models.Employee.service_number == service_number)
-    return bool((await db.execute(stmt)).first())
+    stmt = select(exists().where(models.Employee.service_number == service_number))
+    return bool(await db.scalar(stmt))
 
 
-async def get_topic_by_name_and_number(db: AsyncSession, topic_name: str, topic_number: int) -> models.Topic | None:
-    db_topic = await db.execute(select(models.Topic).where(
-        models.Topic.name == topic_name,
-        models.Topic.number == topic_number
-    ))
-    return db_topic.scalar()
+async def get_employee_service_number(db: AsyncSession, employee_id: int) -> int | None:
+    stmt = select(models.Employee.service_number).where(models.Employee.id == employee_id)
+    service_number: int | None = await db.scalar(stmt)
+    return service_number
 
 
-async def get_post_by_name_and_code(db: AsyncSession, post_name: str, post_code: int) -> models.Post | None:
-    db_post = await db.execute(select(models.Post).where(
-        models.Post.name == post_name,
-        models.Post.code == post_code
-    ))
-    return db_post.scalar()
+async def get_occupied_service_numbers(db: AsyncSession, service_numbers: Collection[int]) -> set[int]:
+    stmt = select(models.Employee.service_number).where(
+        models.Employee.service_number == any_(literal(list(service_numbers), ARRAY(Integer)))
+    )
+    return set((await db.scalars(stmt)).all())
+
+
+async def get_or_create_lookups(
+        db: AsyncSession,
+        model: type[DBModelBase],
+        lookups_in: Collection[LookupInT],
+        lookup_cache: cache.LookupCache[LookupInT],
+) -> dict[LookupInT, int]:
+    """
+    Get IDs of lookup rows by their natural key, insert missing rows
+
+    :param model: lookup model with unique name. Lookup schema fields must be named as model columns
+    :return: Lookups IDs. Lookups that conflict with existing rows by unique column are missing
+    """
+
+    lookups_ids = lookup_cache.get_many(lookups_in)
+    missing_lookups = [i for i in lookups_in if i not in lookups_ids]
+    if not missing_lookups:
+        return lookups_ids
+
+    # Rows are inserted in natural keys order, so concurrent transactions lock unique keys in same order
+    key_fields = list(missing_lookups[0].__fields__)
+    missing_lookups.sort(key=lambda lookup_in: tuple(getattr(lookup_in, field) for field in key_fields))
+
+    table = model.__table__
+    insert_stmt = insert_on_conflict_do_nothing(model).returning(table.c.id)
+    created_ids = set((await db.scalars(insert_stmt, [i.dict() for i in missing_lookups])).all())
+
+    stmt = select(table.c.id, *(table.c[field] for field in key_fields)).where(
+        table.c.name == any_(literal([i.name for i in missing_lookups], ARRAY(String)))
+    )
+    db_ids = {tuple(key): id_ for id_, *key in (await db.execute(stmt)).all()}
 
+    found_ids = {}
+    for lookup_in in missing_lookups:
+        key = tuple(getattr(lookup_in, field) for field in key_fields)
+        if key in db_ids:
+            found_ids[lookup_in] = db_ids[key]
 
-async def get_title_by_name(db: AsyncSession, title_name: str) -> models.Title | None:
-    db_title = await db.execute(select(models.Title).where(models.Title.name == title_name))
-    return db_title.scalar()
+    lookup_cache.update({k: v for k, v in found_ids.items() if v not in created_ids})
+    cache.update_after_commit(db, lookup_cache, {k: v for k, v in found_ids.items() if v in created_ids})
 
+    return lookups_ids | found_ids
 
-async def get_currency_by_name(db: AsyncSession, currency_name: str) -> models.Currency | None:
-    db_currency = await db.execute(select(models.Currency).where(models.Currency.name == currency_name))
-    return db_currency.scalar()
+
+async def get_or_create_topics(
+        db: AsyncSession,
+        topics_in: Collection[schema.TopicIn]
+) -> dict[schema.TopicIn, int]:
+    """
+    :return: Topics IDs. Topics which name or number is occupied by another topic are missing
+    """
+
+    return await get_or_create_lookups(db, models.Topic, topics_in, cache.get_lookups_cache().topics)
+
+
+async def get_or_create_posts(
+        db: AsyncSession,
+        posts_in: Collection[schema.PostIn]
+) -> dict[schema.PostIn, int]:
+    """
+    :return: Posts IDs. Posts which name is occupied by post with another code are missing
+    """
+
+    return await get_or_create_lookups(db, models.Post, posts_in, cache.get_lookups_cache().posts)
 
 
-async def create_salary(db: AsyncSession, salary_in: schema.SalaryIn) -> models.Salary:
-    db_currency = await get_currency_by_name(db, salary_in.currency.name) \
-                  or models.Currency(**salary_in.currency.dict())
-    db_salary = models.Salary(
-        amount=salary_in.amount,
-        currency=db_currency
+async def get_or_create_titles(
+        db: AsyncSession,
+        titles_in: Collection[schema.TitleIn]
+) -> dict[schema.TitleIn, int]:
+    return await get_or_create_lookups(db, models.Title, titles_in, cache.get_lookups_cache().titles)
+
+
+async def get_or_create_currencies(
+        db: AsyncSession,
+        currencies_in: Collection[schema.CurrencyIn]
+) -> dict[schema.CurrencyIn, int]:
+    """
+    Currencies not found in lookups cache get stored rate from exchange rates snapshot if they have none,
+    so employees paid in new currency are ranked by salary before next rates refresh
+    """
+
+    currencies_cache = cache.get_lookups_cache().currencies
+    cached_ids = currencies_cache.get_many(currencies_in)
+    currencies_ids = await get_or_create_lookups(db, models.Currency, currencies_in, currencies_cache)
+    await add_missing_currency_rates(db, {
+        id_: utils.get_usd_rate(currency_in.name)
+        for currency_in, id_ in currencies_ids.items()
+        if currency_in not in cached_ids
+    })
+    return currencies_ids
+
+
+async def get_or_create_salaries(
+        db: AsyncSession,
+        salaries_in: Collection[schema.SalaryIn]
+) -> dict[schema.SalaryIn, int]:
+    salaries_cache = cache.get_lookups_cache().salaries
+    salaries_ids = salaries_cache.get_many(salaries_in)
+    missing_salaries = [i for i in salaries_in if i not in salaries_ids]
+    if not missing_salaries:
+        return salaries_ids
+
+    currencies_ids = await get_or_create_currencies(db, {i.currency for i in missing_salaries})
+
+    amounts_by_currency_id: defaultdict[int, set[decimal.Decimal]] = defaultdict(set)
+    for salary_in in missing_salaries:
+        amounts_by_currency_id[currencies_ids[salary_in.currency]].add(salary_in.amount)
+
+    # Salary has no unique constraint, so existing salaries are selected once per currency
+    db_salaries: dict[tuple[decimal.Decimal, int], int] = {}
+    for currency_id, amounts in amounts_by_currency_id.items():
+        stmt = select(models.Salary.id, models.Salary.amount).where(
+            models.Salary.currency_id == currency_id,
+            models.Salary.amount == any_(literal(list(amounts), ARRAY(Numeric)))
+        )
+        for id_, amount in (await db.execute(stmt)).all():
+            db_salaries.setdefault((amount, currency_id), id_)
+
+    existing_salaries_ids = {
+        i: db_salaries[(i.amount, currencies_ids[i.currency])]
+        for i in missing_salaries
+        if (i.amount, currencies_ids[i.currency]) in db_salaries
+    }
+    salaries_cache.update(existing_salaries_ids)
+
+    new_salaries = [
+        {"amount": amount, "currency_id": currency_id}
+        for currency_id, amounts in amounts_by_currency_id.items()
+        for amount in amounts
+        if (amount, currency_id) not in db_salaries
+    ]
+    if new_salaries:
+        insert_stmt = insert(models.Salary).returning(
+            models.Salary.id,
+            models.Salary.amount,
+            models.Salary.currency_id
+        )
+        for id_, amount, currency_id in (await db.execute(insert_stmt, new_salaries)).all():
+            db_salaries[(amount, currency_id)] = id_
+
+    created_salaries_ids = {
+        i: db_salaries[(i.amount, currencies_ids[i.currency])]
+        for i in missing_salaries
+        if i not in existing_salaries_ids
+    }
+    cache.update_after_commit(db, salaries_cache, created_salaries_ids)
+
+    return salaries_ids | existing_salaries_ids | created_salaries_ids
+
+
+async def warm_up_lookups_cache(db: AsyncSession) -> None:
+    lookups_cache = cache.get_lookups_cache()
+
+    topics_stmt = select(models.Topic).order_by(models.Topic.id.desc()).limit(lookups_cache.topics.maxsize)
+    lookups_cache.topics.update({
+        schema.TopicIn.construct(name=i.name, number=i.number): i.id
+        for i in (await db.scalars(topics_stmt)).all()
+    })
+
+    posts_stmt = select(models.Post).order_by(models.Post.id.desc()).limit(lookups_cache.posts.maxsize)
+    lookups_cache.posts.update({
+        schema.PostIn.construct(name=i.name, code=i.code): i.id
+        for i in (await db.scalars(posts_stmt)).all()
+    })
+
+    titles_stmt = select(models.Title).order_by(models.Title.id.desc()).limit(lookups_cache.titles.maxsize)
+    lookups_cache.titles.update({
+        schema.TitleIn.construct(name=i.name): i.id
+        for i in (await db.scalars(titles_stmt)).all()
+    })
+
+    currencies_stmt = select(models.Currency).order_by(models.Currency.id.desc()).limit(
+        lookups_cache.currencies.maxsize
     )
-    db.add(db_salary)
+    lookups_cache.currencies.update({
+        schema.CurrencyIn.construct(name=i.name): i.id
+        for i in (await db.scalars(currencies_stmt)).all()
+    })
+
+    salaries_stmt = select(models.Salary.id, models.Salary.amount, models.Currency.name).join(
+        models.Currency
+    ).order_by(models.Salary.id.desc()).limit(lookups_cache.salaries.maxsize)
+    lookups_cache.salaries.update({
+        schema.SalaryIn.construct(amount=amount, currency=schema.CurrencyIn.construct(name=currency_name)): id_
+        for id_, amount, currency_name in (await db.execute(salaries_stmt)).all()
+    })
+
+
+async def get_currencies(db: AsyncSession) -> dict[int, str]:
+    """
+    :return: Names of currencies by their IDs
+    """
+
+    stmt = select(models.Currency.id, models.Currency.name)
+    return {id_: name for id_, name in (await db.execute(stmt)).tuples().all()}
+
+
+async def set_currency_rates(db: AsyncSession, rates: dict[int, decimal.Decimal | None]) -> None:
+    """
+    :param rates: Prices of currencies units in USD by currencies IDs
+    """
+
+    if not rates:
+        return
+
+    # Rows are upserted in currencies IDs order, so concurrent refreshes of workers lock them in same order
+    insert_stmt = Insert(cast(Table, models.CurrencyRate.__table__)).values(
+        [{"currency_id": currency_id, "rate": rate} for currency_id, rate in sorted(rates.items())]
+    )
+    stmt = insert_stmt.on_conflict_do_update(
+        index_elements=[models.CurrencyRate.currency_id],
+        set_={"rate": insert_stmt.excluded.rate, "updated_at": func.now()},
+    )
+    await db.execute(stmt)
+
+
+async def add_missing_currency_rates(db: AsyncSession, rates: dict[int, decimal.Decimal | None]) -> None:
+    """
+    Store rates of currencies without stored rate, rates stored by refresh aren't overwritten
+
+    :param rates: Prices of currencies units in USD by currencies IDs
+    """
+
+    if not rates:
+        return
+
+    stmt = insert_on_conflict_do_nothing(models.CurrencyRate).values(
+        [{"currency_id": currency_id, "rate": rate} for currency_id, rate in sorted(rates.items())]
+    )
+    await db.execute(stmt)
+
+
+HireCountKey = tuple[schema.HireCountDimension, int, int]
+
+
+def get_hire_counts_keys(
+        employment_date: datetime.date,
+        topic_id: int,
+        department_number: int,
+        titles_ids: Collection[int],
+) -> list[HireCountKey]:
+    """
+    :return: Dimension, key and year of every hire_count row employee is counted in
+    """
+
+    year = employment_date.year
+    return [
+        ("topic", topic_id, year),
+        ("department", department_number, year),
+        *(("title", title_id, year) for title_id in titles_ids),
+    ]
+
+
+async def update_hire_counts(db: AsyncSession, hire_counts_delta: Counter[HireCountKey]) -> None:
+    """
+    Add delta to hire_count rows, missing rows are inserted.
+    Rows are upserted in keys order, so concurrent transactions lock them in same order
+    """
+
+    rows = [
+        {"dimension": dimension, "key": key, "year": year, "count": count}
+        for (dimension, key, year), count in sorted(hire_counts_delta.items())
+        if count
+    ]
+    for i in range(0, len(rows), HIRE_COUNT_UPSERT_CHUNK_SIZE):
+        insert_stmt = Insert(cast(Table, models.HireCount.__table__)).values(rows[i:i + HIRE_COUNT_UPSERT_CHUNK_SIZE])
+        stmt = insert_stmt.on_conflict_do_update(
+            index_elements=[models.HireCount.dimension, models.HireCount.key, models.HireCount.year],
+            set_={"count": models.HireCount.count + insert_stmt.excluded.count},
+        )
+        await db.execute(stmt)
+
+
+async def rebuild_hire_counts(db: AsyncSession) -> None:
+    """
+    Recount hire_count rows from employees
+    """
+
+    employee = models.Employee
+    employment_year = extract("year", employee.employment_date).cast(Integer)
+    counts_columns = ["dimension", "key", "year", "count"]
+
+    await db.execute(delete(models.HireCount))
+    await db.execute(insert(models.HireCount).from_select(counts_columns, select(
+        literal("topic", String), employee.topic_id, employment_year, func.count()
+    ).group_by(employee.topic_id, employment_year)))
+    await db.execute(insert(models.HireCount).from_select(counts_columns, select(
+        literal("department", String), employee.department_number, employment_year, func.count()
+    ).group_by(employee.department_number, employment_year)))
+    await db.execute(insert(models.HireCount).from_select(counts_columns, select(
+        literal("title", String), models.employee_title_table.c.title_id, employment_year, func.count()
+    ).join(
+        models.employee_title_table, models.employee_title_table.c.employee_id == employee.id
+    ).group_by(models.employee_title_table.c.title_id, employment_year)))
+
+    bump_data_version_after_commit(db)
     await db.commit()
-    await db.refresh(db_salary)
-    return db_salary
 
 
-async def get_salary_by_amount_and_currency(
+async def create_employees(
         db: AsyncSession,
-        salary_amount: decimal.Decimal,
-        salary_currency: schema.CurrencyIn
-) -> models.Salary | None:
-    db_currency = await get_currency_by_name(db, salary_currency.name) or models.Currency(**salary_currency.dict())
-    if not db_currency:
-        return None
-    db_salary = await db.execute(select(models.Salary).where(
-        models.Salary.amount == salary_amount,
-        models.Salary.currency_id == db_currency.id
+        employees_in: Sequence[schema.EmployeeIn],
+        topics_ids: dict[schema.TopicIn, int],
+        posts_ids: dict[schema.PostIn, int],
+) -> list[int]:
+    """
+    Insert employees in one transaction. Topics and posts of employees must be already resolved
+
+    :return: Created employees IDs in order of employees_in
+    """
+
+    if not employees_in:
+        return []
+
+    salaries_ids = await get_or_create_salaries(db, {i.salary for i in employees_in})
+    titles_ids = await get_or_create_titles(db, {title for i in employees_in for title in i.titles})
+
+    employees_rows = [
+        {
+            **i.dict(exclude={"topic", "post", "salary", "titles"}),
+            "topic_id": topics_ids[i.topic],
+            "post_id": posts_ids[i.post],
+            "salary_id": salaries_ids[i.salary],
+        }
+        for i in employees_in
+    ]
+    stmt = insert(models.Employee).returning(models.Employee.id, sort_by_parameter_order=True)
+    employees_ids = list((await db.scalars(stmt, employees_rows)).all())
+
+    employees_titles_ids = [{titles_ids[title] for title in i.titles} for i in employees_in]
+    await add_employees_titles(db, [
+        (employee_id, title_id)
+        for employee_id, employee_titles_ids in zip(employees_ids, employees_titles_ids)
+        for title_id in employee_titles_ids
+    ])
+
+    await update_hire_counts(db, Counter(
+        key
+        for employee_in, employee_titles_ids in zip(employees_in, employees_titles_ids)
+        for key in get_hire_counts_keys(
+            employee_in.employment_date,
+            topics_ids[employee_in.topic],
+            employee_in.department_number,
+            employee_titles_ids,
+        )
     ))
-    return db_salary.scalar()
+
+    bump_data_version_after_commit(db)
+    await db.commit()
+    return employees_ids
+
+
+async def add_employees_titles(db: AsyncSession, employees_titles: Collection[tuple[int, int]]) -> None:
+    """
+    Insert employee_title rows with multi-row INSERTs
+
+    :param employees_titles: Pairs of employee ID and title ID
+    """
+
+    employees_titles = list(employees_titles)
+    for i in range(0, len(employees_titles), EMPLOYEE_TITLE_INSERT_CHUNK_SIZE):
+        stmt = insert(models.employee_title_table).values([
+            {"employee_id": employee_id, "title_id": title_id}
+            for employee_id, title_id in employees_titles[i:i + EMPLOYEE_TITLE_INSERT_CHUNK_SIZE]
+        ])
+        await db.execute(stmt)
+
+
+async def get_or_create_employee_relations_ids(
+        db: AsyncSession,
+        employee_in: schema.EmployeeIn
+) -> tuple[int, int, int, set[int]]:
+    """
+    :return: Topic ID, post ID, salary ID and titles IDs of employee
+    """
+
+    topics_ids = await get_or_create_topics(db, [employee_in.topic])
+    if employee_in.topic not in topics_ids:
+        raise exceptions.EmployeeTopicNotUnique("Topic name or number is occupied by another topic")
+
+    posts_ids = await get_or_create_posts(db, [employee_in.post])
+    if employee_in.post not in posts_ids:
+        raise exceptions.EmployeePostNotUnique("Post name is occupied by post with another code")
+
+    salaries_ids = await get_or_create_salaries(db, [employee_in.salary])
+    titles_ids = await get_or_create_titles(db, set(employee_in.titles))
+
+    return (
+        topics_ids[employee_in.topic],
+        posts_ids[employee_in.post],
+        salaries_ids[employee_in.salary],
+        set(titles_ids.values())
+    )
 
 
 async def create_employee(db: AsyncSession, employee_in: schema.EmployeeIn) -> models.Employee:
-    db_topic = await get_topic_by_name_and_number(
-        db,
-        employee_in.topic.name,
-        employee_in.topic.number
-    ) or models.Topic(**employee_in.topic.dict())
-
-    db_post = await get_post_by_name_and_code(
-        db,
-        employee_in.post.name,
-        employee_in.post.code
-    ) or models.Post(**employee_in.post.dict())
-
-    db_salary = await get_salary_by_amount_and_currency(
-        db,
-        employee_in.salary.amount,
-        employee_in.salary.currency
-    ) or await create_salary(db, employee_in.salary)
-
-    db_titles = [
-        await get_title_by_name(
-            db,
-            i.name
-        ) or models.Title(**i.dict())
-        for i in employee_in.titles
-    ]
+    topic_id, post_id, salary_id, titles_ids = await get_or_create_employee_relations_ids(db, employee_in)
 
     db_employee = models.Employee(
         name=employee_in.name,
@@ -105,49 +474,58 @@ async def create_employee(db: AsyncSession, employee_in: schema.EmployeeIn) -> m
         department_number=employee_in.department_number,
         service_number=employee_in.service_number,
         employment_date=employee_in.employment_date,
-        topic=db_topic,
-        post=db_post,
-        salary=db_salary,
-        titles=db_titles
+        topic_id=topic_id,
+        post_id=post_id,
+        salary_id=salary_id,
     )
 
     db.add(db_employee)
+    await db.flush()
+
+    employee_id = db_employee.id
+    await add_employees_titles(db, [(employee_id, title_id) for title_id in titles_ids])
+    await update_hire_counts(db, Counter(
+        get_hire_counts_keys(employee_in.employment_date, topic_id, employee_in.department_number, titles_ids)
+    ))
+
+    bump_data_version_after_commit(db)
     await db.commit()
-    await db.refresh(db_employee)
-    return db_employee
 
+    created_employee = await get_employee(db, employee_id, populate_existing=True)
+    assert created_employee
+    return created_employee
+
+
+async def lock_employees(db: AsyncSession, employees_ids: Collection[int]) -> list[int]:
+    """
+    Lock employee rows till transaction end. Rows are locked in ID order, so concurrent changes don't deadlock.
+    Employee is read after lock, so hire_count deltas are computed from its last committed values
+    and concurrent changes of the same employee don't subtract the same keys twice
+
+    :return: IDs of existing employees
+    """
+
+    stmt = select(models.Employee.id).where(
+        models.Employee.id == any_(literal(list(employees_ids), ARRAY(Integer)))
+    ).order_by(models.Employee.id).with_for_update()
+    return list((await db.scalars(stmt)).all())
 
-async def update_employee(db: AsyncSession, employee_in: schema.EmployeeIn, employee_id: int) -> models.Employee | None:
-    db_employee = await get_employee(db, employee_id)
 
-    if not db_employee:
+async def update_employee(db: AsyncSession, employee_in: schema.EmployeeIn, employee_id: int) -> models.Employee | None:
+    if not await lock_employees(db, [employee_id]):
         return None
 
-    db_topic = await get_topic_by_name_and_number(
-        db,
-        employee_in.topic.name,
-        employee_in.topic.number
-    ) or models.Topic(**employee_in.topic.dict())
-
-    db_post = await get_post_by_name_and_code(
-        db,
-        employee_in.post.name,
-        employee_in.post.code
-    ) or models.Post(**employee_in.post.dict())
-
-    db_salary = await get_salary_by_amount_and_currency(
-        db,
-        employee_in.salary.amount,
-        employee_in.salary.currency
-    ) or await create_salary(db, employee_in.salary)
-
-    db_titles = [
-        await get_title_by_name(
-            db,
-            i.name
-        ) or models.Title(**i.dict())
-        for i in employee_in.titles
-    ]
+    db_employee = await get_employee(db, employee_id, populate_existing=True)
+    assert db_employee
+
+    topic_id, post_id, salary_id, titles_ids = await get_or_create_employee_relations_ids(db, employee_in)
+    current_titles_ids = {title.id for title in db_employee.titles}
+    hire_counts_delta = Counter(get_hire_counts_keys(
+        employee_in.employment_date, topic_id, employee_in.department_number, titles_ids
+    ))
+    hire_counts_delta.subtract(get_hire_counts_keys(
+        db_employee.employment_date, db_employee.topic_id, db_employee.department_number, current_titles_ids
+    ))
 
     db_employee.name = employee_in.name
     db_employee.surname = employee_in.surname
@@ -155,98 +533,301 @@ async def update_employee(db: AsyncSession, employee_in: schema.EmployeeIn, empl
     db_employee.department_number = employee_in.department_number
     db_employee.service_number = employee_in.service_number
     db_employee.employment_date = employee_in.employment_date
-    db_employee.topic = db_topic
-    db_employee.post = db_post
-    db_employee.salary = db_salary
-    db_employee.titles = db_titles
+    db_employee.topic_id = topic_id
+    db_employee.post_id = post_id
+    db_employee.salary_id = salary_id
 
     db.add(db_employee)
+    await db.flush()
+
+    removed_titles_ids = current_titles_ids - titles_ids
+    if removed_titles_ids:
+        await db.execute(
+            delete(models.employee_title_table).where(
+                models.employee_title_table.c.employee_id == employee_id,
+                models.employee_title_table.c.title_id == any_(literal(list(removed_titles_ids), ARRAY(Integer)))
+            )
+        )
+    await add_employees_titles(db, [(employee_id, title_id) for title_id in titles_ids - current_titles_ids])
+    await update_hire_counts(db, hire_counts_delta)
+
+    bump_data_version_after_commit(db)
     await db.commit()
-    await db.refresh(db_employee)
-    return db_employee
+    return await get_employee(db, employee_id, populate_existing=True)
 
 
-async def get_employee(db: AsyncSession, employee_id: int) -> models.Employee | None:
-    db_employee = await db.get(models.Employee, employee_id)
+async def get_employee(
+        db: AsyncSession,
+        employee_id: int,
+        populate_existing: bool = False
+) -> models.Employee | None:
+    """
+    :param populate_existing: Reload employee even if it is already in session, e.g. after its relations changed
+    """
+
+    db_employee = await db.get(
+        models.Employee,
+        employee_id,
+        options=EMPLOYEE_LOAD_OPTIONS,
+        populate_existing=populate_existing
+    )
     return db_employee
 
 
-async def get_employees(db: AsyncSession, skip: int, limit: int) -> list[models.Employee]:
-    stmt = select(models.Employee).offset(skip).limit(limit).order_by(asc(models.Employee.id))
-    return list((await db.scalars(stmt)).all())
+async def get_employees(
+        db: AsyncSession,
+        limit: int,
+        sort_by: schema.EmployeesSortKey = "id",
+        after: Sequence[Any] | None = None
+) -> list[models.Employee]:
+    """
+    Keyset pagination, so any page costs the same as the first one. Every sort key is backed by index
+
+    :param after: Sort columns values of the last employee of the previous page
+    """
+
+    sort_columns = EMPLOYEES_SORT_COLUMNS[sort_by]
+    stmt = select(models.Employee).options(*EMPLOYEE_LOAD_OPTIONS).order_by(*sort_columns).limit(limit)
+    if after is not None:
+        stmt = stmt.where(tuple_(*sort_columns) > tuple_(*after))
+    return list((await db.scalars(stmt)).unique().all())
+
+
+async def get_employees_by_offset(db: AsyncSession, skip: int, limit: int) -> list[models.Employee]:
+    stmt = select(models.Employee).options(*EMPLOYEE_LOAD_OPTIONS).offset(skip).limit(limit).order_by(
+        asc(models.Employee.id)
+    )
+    return list((await db.scalars(stmt)).unique().all())
 
 
 async def get_employees_by_title(db: AsyncSession, title: schema.TitleIn) -> list[models.Employee]:
-    stmt = select(models.Employee).join(models.Employee, models.Title.employees).where(models.Title.name == title.name)
-    return list((await db.scalars(stmt)).all())
+    stmt = select(models.Employee).options(*EMPLOYEE_LOAD_OPTIONS).join(
+        models.Employee, models.Title.employees
+    ).where(models.Title.name == title.name)
+    return list((await db.scalars(stmt)).unique().all())
 
 
 async def get_all_employees(db: AsyncSession) -> list[models.Employee]:
-    stmt = select(models.Employee).order_by(asc(models.Employee.id))
-    return list((await db.scalars(stmt)).all())
+    stmt = select(models.Employee).options(*EMPLOYEE_LOAD_OPTIONS).order_by(asc(models.Employee.id))
+    return list((await db.scalars(stmt)).unique().all())
+
+
+async def stream_all_employees(db: AsyncSession, batch_size: int = 1000) -> AsyncIterator[models.Employee]:
+    """
+    Read employees with server-side cursor, so only one batch is held in memory at a time
+    """
+
+    stmt = select(models.Employee).options(*EMPLOYEE_LOAD_OPTIONS).order_by(
+        asc(models.Employee.id)
+    ).execution_options(yield_per=batch_size)
+
+    async for db_employee in await db.stream_scalars(stmt):
+        yield db_employee
 
 
 async def delete_employee(db: AsyncSession, employee_id: int) -> models.Employee | None:
-    db_employee = await get_employee(db, employee_id)
-    if not db_employee:
+    if not await lock_employees(db, [employee_id]):
         return None
 
+    db_employee = await get_employee(db, employee_id, populate_existing=True)
+    assert db_employee
+
     await db.delete(db_employee)
+    hire_counts_delta: Counter[HireCountKey] = Counter()
+    hire_counts_delta.subtract(get_hire_counts_keys(
+        db_employee.employment_date,
+        db_employee.topic_id,
+        db_employee.department_number,
+        [title.id for title in db_employee.titles],
+    ))
+    await update_hire_counts(db, hire_counts_delta)
+
+    bump_data_version_after_commit(db)
     await db.commit()
 
     return db_employee
 
 
-async def search_employees(db: AsyncSession, search_model: schema.EmployeeSearchModel) -> list[models.Employee]:
-    # TODO: Refactor this spaghetti
+async def delete_employees(db: AsyncSession, employees_ids: Collection[int]) -> list[int]:
+    """
+    :return: IDs of deleted employees. Not existing IDs are skipped
+    """
+
+    employees_ids = await lock_employees(db, employees_ids)
+    employees_ids_array = literal(employees_ids, ARRAY(Integer))
+
+    employees_titles_stmt = delete(models.employee_title_table).where(
+        models.employee_title_table.c.employee_id == any_(employees_ids_array)
+    ).returning(models.employee_title_table.c.employee_id, models.employee_title_table.c.title_id)
+    employees_titles_ids: defaultdict[int, list[int]] = defaultdict(list)
+    for employee_id, title_id in (await db.execute(employees_titles_stmt)).tuples().all():
+        employees_titles_ids[employee_id].append(title_id)
+
+    stmt = delete(models.Employee).where(
+        models.Employee.id == any_(employees_ids_array)
+    ).returning(
+        models.Employee.id, models.Employee.employment_date, models.Employee.topic_id, models.Employee.department_number
+    ).execution_options(synchronize_session=False)
+    deleted_employees = (await db.execute(stmt)).tuples().all()
+
+    hire_counts_delta: Counter[HireCountKey] = Counter()
+    for employee_id, employment_date, topic_id, department_number in deleted_employees:
+        hire_counts_delta.subtract(get_hire_counts_keys(
+            employment_date, topic_id, department_number, employees_titles_ids[employee_id]
+        ))
+    await update_hire_counts(db, hire_counts_delta)
+
+    bump_data_version_after_commit(db)
+    await db.commit()
+    return [i[0] for i in deleted_employees]
 
-    stmt = select(models.Employee)
 
-    if search_model.topic:
-        stmt = stmt.join(models.Topic)
-        if search_model.topic.name:
-            stmt = stmt.where(models.Topic.name == search_model.topic.name)
-        if search_model.topic.number:
-            stmt = stmt.where(models.Topic.number == search_model.topic.number)
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
-    if search_model.post:
-        stmt = stmt.join(models.Post)
-        if search_model.post.name:
-            stmt = stmt.where(models.Post.name == search_model.post.name)
-        if search_model.post.code:
-            stmt = stmt.where(models.Post.code == search_model.post.code)
 
-    if search_model.salary:
-        stmt = stmt.join(models.Salary)
-        if search_model.salary.amount:
-            stmt = stmt.where(models.Salary.amount == search_model.salary.amount)
-        if search_model.salary.currency:
-            stmt = stmt.join(models.Currency)
-            if search_model.salary.currency.name:
-                stmt = stmt.where(models.Currency.name == search_model.salary.currency.name)
+def get_employee_names_to_search(
+        search_model: schema.EmployeeSearchModel
+) -> list[tuple[InstrumentedAttribute[str], str]]:
+    names = [
+        (models.Employee.name, search_model.name),
+        (models.Employee.surname, search_model.surname),
+        (models.Employee.patronymic, search_model.patronymic),
+    ]
+    return [(column, value) for column, value in names if value is not None]
 
-    if search_model.titles:
-        stmt = stmt.join(models.Title, models.Employee.titles)
-        titles_names = [title.name for title in search_model.titles]
-        stmt = stmt.where(models.Title.name.in_(titles_names))
 
-    if search_model.name:
-        stmt = stmt.where(models.Employee.name == search_model.name)
+def get_name_filter(
+        column: InstrumentedAttribute[str],
+        value: str,
+        name_match: schema.NameMatchMode
+) -> ColumnElement[bool]:
+    """
+    Prefix and fuzzy filters are case-insensitive and use trigram GIN indexes of name columns
+    """
 
-    if search_model.surname:
-        stmt = stmt.where(models.Employee.surname == search_model.surname)
+    if name_match == "prefix":
+        return column.ilike(f"{escape_like(value)}%", escape="\\")
+    if name_match == "fuzzy":
+        # pg_trgm "similar to" operator, true if similarity is greater than pg_trgm.similarity_threshold
+        return column.bool_op("%")(value)
+    return column == value
 
-    if search_model.patronymic:
-        stmt = stmt.where(models.Employee.patronymic == search_model.patronymic)
 
-    if search_model.department_number:
-        stmt = stmt.where(models.Employee.department_number == search_model.department_number)
+def get_employees_search_rank(search_model: schema.EmployeeSearchModel) -> ColumnElement[float]:
+    """
+    :return: Sum of trigram similarities of searched names. Constant for exact names match
+    """
 
-    if search_model.service_number:
-        stmt = stmt.where(models.Employee.service_number == search_model.service_number)
+    if search_model.name_match == "exact":
+        return literal(0.0, Float)
+
+    similarities = [
+        func.similarity(column, value, type_=Float)
+        for column, value in get_employee_names_to_search(search_model)
+    ]
+    return sum(similarities[1:], similarities[0]) if similarities else literal(0.0, Float)
 
-    if search_model.employment_date:
-        stmt = stmt.where(models.Employee.employment_date == search_model.employment_date)
 
-    db_employees = list((await db.scalars(stmt)).all())
-    return db_employees
+def get_employees_search_filters(search_model: schema.EmployeeSearchModel) -> list[ColumnElement[bool]]:
+    """
+    Filters are always built in the same order and lists are passed as one array parameter, so the same set of
+    search fields always produces the same SQL and hits asyncpg prepared statements cache.
+    Relations are filtered with EXISTS, so employee matching several titles is returned once
+    """
+
+    filters: list[ColumnElement[bool]] = [
+        get_name_filter(column, value, search_model.name_match)
+        for column, value in get_employee_names_to_search(search_model)
+    ]
+
+    if search_model.department_number is not None:
+        filters.append(models.Employee.department_number == search_model.department_number)
+    if search_model.service_number is not None:
+        filters.append(models.Employee.service_number == search_model.service_number)
+    if search_model.employment_date is not None:
+        filters.append(models.Employee.employment_date == search_model.employment_date)
+    if search_model.employment_date_min is not None:
+        filters.append(models.Employee.employment_date >= search_model.employment_date_min)
+    if search_model.employment_date_max is not None:
+        filters.append(models.Employee.employment_date <= search_model.employment_date_max)
+
+    if search_model.topic is not None:
+        topic_filters = []
+        if search_model.topic.name is not None:
+            topic_filters.append(models.Topic.name == search_model.topic.name)
+        if search_model.topic.number is not None:
+            topic_filters.append(models.Topic.number == search_model.topic.number)
+        if topic_filters:
+            filters.append(models.Employee.topic.has(and_(*topic_filters)))
+
+    if search_model.post is not None:
+        post_filters = []
+        if search_model.post.name is not None:
+            post_filters.append(models.Post.name == search_model.post.name)
+        if search_model.post.code is not None:
+            post_filters.append(models.Post.code == search_model.post.code)
+        if post_filters:
+            filters.append(models.Employee.post.has(and_(*post_filters)))
+
+    if search_model.salary is not None:
+        salary_filters = []
+        if search_model.salary.amount is not None:
+            salary_filters.append(models.Salary.amount == search_model.salary.amount)
+        if search_model.salary.amount_min is not None:
+            salary_filters.append(models.Salary.amount >= search_model.salary.amount_min)
+        if search_model.salary.amount_max is not None:
+            salary_filters.append(models.Salary.amount <= search_model.salary.amount_max)
+        if search_model.salary.currency is not None and search_model.salary.currency.name is not None:
+            salary_filters.append(models.Salary.currency.has(models.Currency.name == search_model.salary.currency.name))
+        if salary_filters:
+            filters.append(models.Employee.salary.has(and_(*salary_filters)))
+
+    if search_model.titles:
+        titles_names = sorted({title.name for title in search_model.titles if title.name is not None})
+        if titles_names:
+            filters.append(models.Employee.titles.any(
+                models.Title.name == any_(literal(titles_names, ARRAY(String)))
+            ))
+
+    return filters
+
+
+async def search_employees(
+        db: AsyncSession,
+        search_model: schema.EmployeeSearchModel,
+        limit: int,
+        sort_by: schema.EmployeesSearchSortKey = "id",
+        after: Sequence[Any] | None = None
+) -> list[models.Employee]:
+    """
+    Employees having any of requested titles and matching all other fields. Keyset pagination as in get_employees.
+    Search rank is loaded to Employee.search_rank
+
+    :param sort_by: "relevance" sorts by search rank descending
+    :param after: Sort columns values of the last employee of the previous page. Rank is negated for "relevance"
+    """
+
+    search_rank = get_employees_search_rank(search_model)
+
+    sort_columns: tuple[ColumnElement[Any] | InstrumentedAttribute[Any], ...]
+    if sort_by == "relevance":
+        sort_columns = (-search_rank, models.Employee.id)
+    else:
+        sort_columns = EMPLOYEES_SORT_COLUMNS[sort_by]
+
+    stmt = select(models.Employee).options(
+        *EMPLOYEE_LOAD_OPTIONS,
+        with_expression(models.Employee.search_rank, search_rank)
+    ).where(
+        *get_employees_search_filters(search_model)
+    ).order_by(*sort_columns).limit(limit)
+    if after is not None:
+        stmt = stmt.where(tuple_(*sort_columns) > tuple_(*after))
+    return list((await db.scalars(stmt)).unique().all())
+
+
+async def count_employees(db: AsyncSession, search_model: schema.EmployeeSearchModel) -> int:
+    stmt = select(func.count()).select_from(models.Employee).where(*get_employees_search_filters(search_model))
+    employees_count: int = await db.scalar(stmt) or 0
+    return employees_count
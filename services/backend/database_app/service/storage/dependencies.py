@@ -1,12 +1,13 @@
-from typing import Annotated
+from typing import Annotated, Any
 
 from fastapi import Depends, Path, Body
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from database_app.config import get_settings
 from database_app.dependencies import get_db_stub
 from . import service
 from .schema import EmployeeIn
-from .exceptions import EmployeeServiceNumberNotUnique, EmployeeIDDoesntExist
+from .exceptions import EmployeeServiceNumberNotUnique, EmployeeIDDoesntExist, EmployeesBulkTooLarge
 
 
 async def employee_service_number_not_occupied(
@@ -37,3 +38,12 @@ async def employee_id_exists(
     if not await service.is_employee_id_exist(db, employee_id):
         raise EmployeeIDDoesntExist("ID must be occupied by employee")
     return employee_id
+
+
+async def employees_bulk_size_allowed(
+        employees: Annotated[list[Any], Body()]
+) -> list[Any]:
+    max_size = get_settings().storage.employees_bulk_create_max_size
+    if len(employees) > max_size:
+        raise EmployeesBulkTooLarge(f"Bulk should have at most {max_size} employees")
+    return employees
@@ -6,13 +6,33 @@ class EmployeeIDDoesntExist(ValueError):
     pass
 
 
-class ExchangeRatesAPIError(IOError):
+class EmployeeTopicNotUnique(ValueError):
     pass
 
 
-class ExchangeRatesUnknownCurrency(ValueError):
+class EmployeePostNotUnique(ValueError):
     pass
 
 
-class ExchangeRatesAPIWrongJson(ValueError):
+class InvalidCursor(ValueError):
+    pass
+
+
+class EmployeesBulkTooLarge(ValueError):
+    pass
+
+
+class ExchangeRatesError(Exception):
+    pass
+
+
+class ExchangeRatesAPIError(ExchangeRatesError, IOError):
+    pass
+
+
+class ExchangeRatesUnknownCurrency(ExchangeRatesError, ValueError):
+    pass
+
+
+class ExchangeRatesAPIWrongJson(ExchangeRatesError, ValueError):
     pass
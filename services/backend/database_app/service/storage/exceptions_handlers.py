@@ -1,7 +1,14 @@
 from fastapi import Request, Response, status
 from fastapi.responses import JSONResponse
 
-from .exceptions import EmployeeServiceNumberNotUnique, EmployeeIDDoesntExist
+from .exceptions import (
+    EmployeeServiceNumberNotUnique,
+    EmployeeIDDoesntExist,
+    EmployeeTopicNotUnique,
+    EmployeePostNotUnique,
+    InvalidCursor,
+    EmployeesBulkTooLarge
+)
 from ...schema import ErrorResponseBody, ErrorInfo
 
 
@@ -39,3 +46,74 @@ async def employee_id_doesnt_exist_handler(request: Request, exc: EmployeeIDDoes
             ]
         ).dict()
     )
+
+
+async def employee_topic_not_unique_handler(request: Request, exc: EmployeeTopicNotUnique) -> Response:
+    return JSONResponse(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        content=ErrorResponseBody(
+            [
+                ErrorInfo(
+                    loc=[
+                        "body",
+                        "topic"
+                    ],
+                    msg=str(exc),
+                    type_="value_error.not_unique"
+                )
+            ]
+        ).dict()
+    )
+
+
+async def employee_post_not_unique_handler(request: Request, exc: EmployeePostNotUnique) -> Response:
+    return JSONResponse(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        content=ErrorResponseBody(
+            [
+                ErrorInfo(
+                    loc=[
+                        "body",
+                        "post"
+                    ],
+                    msg=str(exc),
+                    type_="value_error.not_unique"
+                )
+            ]
+        ).dict()
+    )
+
+
+async def invalid_cursor_handler(request: Request, exc: InvalidCursor) -> Response:
+    return JSONResponse(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        content=ErrorResponseBody(
+            [
+                ErrorInfo(
+                    loc=[
+                        "query",
+                        "cursor"
+                    ],
+                    msg=str(exc),
+                    type_="value_error.invalid_cursor"
+                )
+            ]
+        ).dict()
+    )
+
+
+async def employees_bulk_too_large_handler(request: Request, exc: EmployeesBulkTooLarge) -> Response:
+    return JSONResponse(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        content=ErrorResponseBody(
+            [
+                ErrorInfo(
+                    loc=[
+                        "body"
+                    ],
+                    msg=str(exc),
+                    type_="value_error.list.max_items"
+                )
+            ]
+        ).dict()
+    )
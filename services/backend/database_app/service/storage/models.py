@@ -3,8 +3,8 @@
 import datetime
 import decimal
 
-from sqlalchemy import String, ForeignKey, Table, Column, Numeric
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, ForeignKey, Table, Column, Numeric, Index, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship, query_expression
 
 from database_app.database import DBModelBase
 
@@ -13,37 +13,56 @@ employee_title_table = Table(
     "employee_title",
     DBModelBase.metadata,
     Column("employee_id", ForeignKey("employee.id"), primary_key=True),
-    Column("title_id", ForeignKey("title.id"), primary_key=True),
+    Column("title_id", ForeignKey("title.id"), primary_key=True, index=True),
 )
 
 
 class Employee(DBModelBase):
     __tablename__ = "employee"
+    __table_args__ = (
+        Index("ix_employee_employment_date_id", "employment_date", "id"),
+        Index("ix_employee_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index(
+            "ix_employee_surname_trgm",
+            "surname",
+            postgresql_using="gin",
+            postgresql_ops={"surname": "gin_trgm_ops"}
+        ),
+        Index(
+            "ix_employee_patronymic_trgm",
+            "patronymic",
+            postgresql_using="gin",
+            postgresql_ops={"patronymic": "gin_trgm_ops"}
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
     name: Mapped[str] = mapped_column(String(length=100))
     surname: Mapped[str] = mapped_column(String(length=100))
     patronymic: Mapped[str] = mapped_column(String(length=100))
-    department_number: Mapped[int]
+    department_number: Mapped[int] = mapped_column(index=True)
     service_number: Mapped[int] = mapped_column(unique=True)
     employment_date: Mapped[datetime.date]
 
-    topic_id: Mapped[int] = mapped_column(ForeignKey("topic.id"))
-    topic: Mapped["Topic"] = relationship(back_populates="employees", lazy="subquery")
+    topic_id: Mapped[int] = mapped_column(ForeignKey("topic.id"), index=True)
+    topic: Mapped["Topic"] = relationship(back_populates="employees", lazy="raise")
 
-    post_id: Mapped[int] = mapped_column(ForeignKey("post.id"))
-    post: Mapped["Post"] = relationship(back_populates="employees", lazy="subquery")
+    post_id: Mapped[int] = mapped_column(ForeignKey("post.id"), index=True)
+    post: Mapped["Post"] = relationship(back_populates="employees", lazy="raise")
 
-    salary_id: Mapped[int] = mapped_column(ForeignKey("salary.id"))
-    salary: Mapped["Salary"] = relationship(back_populates="employees", lazy="subquery")
+    salary_id: Mapped[int] = mapped_column(ForeignKey("salary.id"), index=True)
+    salary: Mapped["Salary"] = relationship(back_populates="employees", lazy="raise")
 
     titles: Mapped[list["Title"]] = relationship(
         secondary=employee_title_table,
         back_populates="employees",
-        lazy="subquery"
+        lazy="raise"
     )
 
+    # Loaded only by search
+    search_rank: Mapped[float | None] = query_expression()
+
 
 class Topic(DBModelBase):
     __tablename__ = "topic"
@@ -79,12 +98,15 @@ class Title(DBModelBase):
 
 class Salary(DBModelBase):
     __tablename__ = "salary"
+    __table_args__ = (
+        Index("ix_salary_currency_id_amount", "currency_id", "amount"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
-    amount: Mapped[decimal.Decimal] = mapped_column(Numeric(scale=2))
+    amount: Mapped[decimal.Decimal] = mapped_column(Numeric(scale=2), index=True)
     currency_id: Mapped[int] = mapped_column(ForeignKey("currency.id"))
-    currency: Mapped["Currency"] = relationship(back_populates="salaries", lazy="subquery")
+    currency: Mapped["Currency"] = relationship(back_populates="salaries", lazy="raise")
 
     employees: Mapped[list[Employee]] = relationship(back_populates="salary")
 
@@ -97,3 +119,28 @@ class Currency(DBModelBase):
     name: Mapped[str] = mapped_column(String(length=3), unique=True)
 
     salaries: Mapped[list[Salary]] = relationship(back_populates="currency")
+
+
+class CurrencyRate(DBModelBase):
+    __tablename__ = "currency_rate"
+
+    currency_id: Mapped[int] = mapped_column(ForeignKey("currency.id"), primary_key=True)
+
+    # Price of currency unit in USD. NULL if currency is unknown to exchange rates API
+    rate: Mapped[decimal.Decimal | None] = mapped_column(Numeric)
+    updated_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class HireCount(DBModelBase):
+    """
+    Employees count by employment year and title, topic or department.
+    Maintained by storage crud in same transactions as employees
+    """
+
+    __tablename__ = "hire_count"
+
+    dimension: Mapped[str] = mapped_column(String(length=20), primary_key=True)
+    # Title ID, topic ID or department number
+    key: Mapped[int] = mapped_column(primary_key=True)
+    year: Mapped[int] = mapped_column(primary_key=True)
+    count: Mapped[int]
@@ -0,0 +1,37 @@
+import base64
+import binascii
+import json
+from typing import Any, Sequence
+
+from . import exceptions
+
+
+def encode_cursor(sort_key: str, last_values: Sequence[Any]) -> str:
+    """
+    :param sort_key: Key the page was sorted by. Cursor can't be used with other sort key
+    :param last_values: Sort columns values of the last row of the page
+    :return: Opaque url-safe cursor of the next page
+    """
+
+    cursor_data = json.dumps({"sort_key": sort_key, "last_values": list(last_values)}, default=str)
+    return base64.urlsafe_b64encode(cursor_data.encode()).decode()
+
+
+def decode_cursor(cursor: str, sort_key: str) -> list[Any]:
+    """
+    :return: Sort columns values of the last row of the previous page
+    """
+
+    try:
+        cursor_data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as err:
+        raise exceptions.InvalidCursor("Cursor is malformed") from err
+
+    if not isinstance(cursor_data, dict) or not isinstance(cursor_data.get("last_values"), list):
+        raise exceptions.InvalidCursor("Cursor is malformed")
+
+    if cursor_data.get("sort_key") != sort_key:
+        raise exceptions.InvalidCursor("Cursor was issued for another sort key")
+
+    last_values: list[Any] = cursor_data["last_values"]
+    return last_values
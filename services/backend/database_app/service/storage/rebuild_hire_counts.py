@@ -0,0 +1,19 @@
+"""
+Recount hire_count summary table from employees:
+
+    python -m database_app.service.storage.rebuild_hire_counts
+"""
+
+import asyncio
+
+from ...dependencies import get_db
+from . import crud
+
+
+async def rebuild_hire_counts() -> None:
+    async for db in get_db():
+        await crud.rebuild_hire_counts(db)
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_hire_counts())
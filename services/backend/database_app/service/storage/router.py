@@ -1,15 +1,18 @@
-from typing import Annotated
+from typing import Annotated, Any, Literal
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import APIRouter, Depends, Query, status, Body
+from fastapi.responses import StreamingResponse
 
 from database_app.service.storage import schema, service
-from ...dependencies import get_db_stub
-from ...schema import ErrorResponseBody
+from ...dependencies import get_db_stub, check_data_version_etag
+from ...schema import ErrorResponseBody, CacheStats
+from .exceptions import EmployeeIDDoesntExist
 from .dependencies import (
     employee_service_number_not_occupied,
     employee_id_exists,
-    employee_service_number_available_to_employee
+    employee_service_number_available_to_employee,
+    employees_bulk_size_allowed
 )
 
 
@@ -25,20 +28,45 @@ async def create_employee(
         employee: Annotated[schema.EmployeeIn, Depends(employee_service_number_not_occupied)],
         db: Annotated[AsyncSession, Depends(get_db_stub)],
 ) -> schema.Employee:
+    """
+    Query budget: 1 service number check, 2 per not cached relation table, then insert of employee
+    and its titles and 2 statements to load the created employee
+    """
+
     return await service.create_employee(db, employee)
 
 
+@router.post(
+    path="/employees/bulk",
+    response_model=schema.EmployeesBulkCreateOut,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        422: {"model": ErrorResponseBody}
+    },
+)
+async def create_employees(
+        employees: Annotated[list[Any], Depends(employees_bulk_size_allowed)],
+        db: Annotated[AsyncSession, Depends(get_db_stub)],
+) -> schema.EmployeesBulkCreateOut:
+    return await service.create_employees(db, employees)
+
+
 @router.get(
     path="/employee/{employee_id}",
     response_model=schema.EmployeeOut,
     responses={
         404: {"model": ErrorResponseBody}
-    }
+    },
+    dependencies=[Depends(check_data_version_etag)],
 )
 async def get_employee(
         employee_id: Annotated[int, Depends(employee_id_exists)],
         db: Annotated[AsyncSession, Depends(get_db_stub)],
 ) -> schema.Employee:
+    """
+    Query budget: 1 ID check and 2 statements to load employee (relations joined, titles selected by IN)
+    """
+
     employee = await service.get_employee(db, employee_id)
     assert employee
     return employee
@@ -46,14 +74,80 @@ async def get_employee(
 
 @router.get(
     path="/employees",
-    response_model=list[schema.EmployeeOut]
+    response_model=list[schema.EmployeeOut],
+    dependencies=[Depends(check_data_version_etag)],
+    deprecated=True,
 )
 async def get_employees(
         db: Annotated[AsyncSession, Depends(get_db_stub)],
         skip: int = Query(default=0),
         limit: int = Query(default=100),
 ) -> list[schema.Employee]:
-    return await service.get_employees(db, skip, limit)
+    """
+    Employees ordered by ID. Use "/employees/page", deep pages of which cost the same as the first one
+
+    Query budget: 2 statements regardless of page size (relations joined, titles selected by IN)
+    """
+
+    return await service.get_employees_by_offset(db, skip, limit)
+
+
+@router.get(
+    path="/employees/page",
+    response_model=schema.EmployeesPageOut,
+    responses={
+        422: {"model": ErrorResponseBody}
+    },
+    dependencies=[Depends(check_data_version_etag)],
+)
+async def get_employees_page(
+        db: Annotated[AsyncSession, Depends(get_db_stub)],
+        limit: int = Query(default=100, ge=1, le=1000),
+        sort_by: schema.EmployeesSortKey = Query(default="id"),
+        cursor: str | None = Query(default=None),
+) -> schema.EmployeesPage:
+    """
+    Employees ordered by "sort_by" and ID. Pass "next_cursor" of the response as "cursor" with the same "sort_by"
+    to get the next page, "next_cursor" is null on the last page
+
+    Query budget: 2 statements regardless of page size and depth (relations joined, titles selected by IN)
+    """
+
+    return await service.get_employees(db, limit, sort_by, cursor)
+
+
+@router.get(
+    path="/employees/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {
+                "application/x-ndjson": {},
+                "text/csv": {}
+            }
+        }
+    }
+)
+async def export_employees(
+        db: Annotated[AsyncSession, Depends(get_db_stub)],
+        export_format: Annotated[Literal["ndjson", "csv"], Query(alias="format")] = "ndjson",
+) -> StreamingResponse:
+    """
+    All employees ordered by ID, one JSON object per line or CSV with titles joined by ";".
+    Employees are read with server-side cursor and streamed in batches, so memory usage doesn't depend on table size
+
+    Query budget: 2 statements per 1000 employees (relations joined, titles selected by IN)
+    """
+
+    media_types = {
+        "ndjson": "application/x-ndjson",
+        "csv": "text/csv",
+    }
+    return StreamingResponse(
+        service.export_employees(db, export_format),
+        media_type=media_types[export_format],
+        headers={"Content-Disposition": f"attachment; filename=employees.{export_format}"}
+    )
 
 
 @router.put(
@@ -68,8 +162,15 @@ async def update_employee(
         employee_id: Annotated[int, Depends(employee_id_exists)],
         db: Annotated[AsyncSession, Depends(get_db_stub)],
 ) -> schema.Employee:
+    """
+    Query budget: 1 service number check, 1 ID check, 1 lock, 2 to load employee, 2 per not cached relation
+    table, update of employee and changed titles and 2 statements to reload the employee
+    """
+
     employee = await service.update_employee(db, employee_in, employee_id)
-    assert employee
+    # Employee may be deleted concurrently after ID check
+    if employee is None:
+        raise EmployeeIDDoesntExist("ID must be occupied by employee")
     return employee
 
 
@@ -84,17 +185,64 @@ async def delete_employee(
         employee_id: Annotated[int, Depends(employee_id_exists)],
         db: Annotated[AsyncSession, Depends(get_db_stub)],
 ) -> schema.Employee:
+    """
+    Query budget: 1 ID check, 1 lock, 2 statements to load employee and 2 deletes
+    """
+
     employee = await service.delete_employee(db, employee_id)
-    assert employee
+    # Employee may be deleted concurrently after ID check
+    if employee is None:
+        raise EmployeeIDDoesntExist("ID must be occupied by employee")
     return employee
 
 
+@router.delete(
+    path="/employees",
+    response_model=list[int]
+)
+async def delete_employees(
+        employees_ids: Annotated[list[int], Body()],
+        db: Annotated[AsyncSession, Depends(get_db_stub)],
+) -> list[int]:
+    return await service.delete_employees(db, employees_ids)
+
+
 @router.post(
     path="/search/employees",
-    response_model=list[schema.EmployeeOut]
+    response_model=schema.EmployeesSearchPageOut,
+    responses={
+        422: {"model": ErrorResponseBody}
+    },
+    dependencies=[Depends(check_data_version_etag)],
 )
 async def search_employees(
         search_model: schema.EmployeeSearchModel,
-        db: Annotated[AsyncSession, Depends(get_db_stub)]
-) -> list[schema.Employee]:
-    return await service.search_employees(db, search_model)
+        db: Annotated[AsyncSession, Depends(get_db_stub)],
+        limit: int = Query(default=100, ge=1, le=1000),
+        sort_by: schema.EmployeesSearchSortKey = Query(default="id"),
+        cursor: str | None = Query(default=None),
+        with_total_count: bool = Query(default=False),
+) -> schema.EmployeesSearchPage:
+    """
+    Employees having any of requested titles and matching all other set fields, paginated as GET /employees.
+    "total_count" is counted only if "with_total_count" is set, otherwise it is null.
+    Names are matched exactly, case-insensitively by prefix or by trigram similarity, depending on "name_match".
+    "relevance" sort key ranks employees by similarity of searched names
+
+    Query budget: 2 statements regardless of page size and depth (relations joined, titles selected by IN),
+    1 more with total count
+    """
+
+    return await service.search_employees(db, search_model, limit, sort_by, cursor, with_total_count)
+
+
+@router.get(
+    path="/search/cache_stats",
+    response_model=CacheStats
+)
+async def get_search_cache_stats() -> CacheStats:
+    """
+    Hits and misses of per-process search results cache
+    """
+
+    return service.get_search_cache_stats()
@@ -1,9 +1,11 @@
 import datetime
 import decimal
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field, validator
 
 from . import utils
+from ...schema import ErrorInfo
 
 
 class Base(BaseModel, frozen=True):
@@ -236,6 +238,38 @@ class EmployeeOut(EmployeeBase):
     titles: list[TitleOut]
 
 
+EmployeesSortKey = Literal["id", "employment_date"]
+
+EmployeesSearchSortKey = Literal["id", "employment_date", "relevance"]
+
+NameMatchMode = Literal["exact", "prefix", "fuzzy"]
+
+HireCountDimension = Literal["title", "topic", "department"]
+
+
+class EmployeesPage(Base):
+    employees: list[Employee]
+    next_cursor: str | None
+
+
+class EmployeesPageOut(Base):
+    employees: list[EmployeeOut]
+    next_cursor: str | None
+
+
+class EmployeesSearchPage(EmployeesPage):
+    total_count: int | None
+
+
+class EmployeesSearchPageOut(EmployeesPageOut):
+    total_count: int | None
+
+
+class EmployeesBulkCreateOut(Base):
+    employees_ids: list[int | None]
+    errors: list[ErrorInfo]
+
+
 class TopicSearchModel(Base):
     name: str | None = None
     number: int | None = None
@@ -252,8 +286,21 @@ class CurrencySearchModel(Base):
 
 class SalarySearchModel(Base):
     amount: decimal.Decimal | None = None
+    amount_min: decimal.Decimal | None = None
+    amount_max: decimal.Decimal | None = None
     currency: CurrencySearchModel | None = None
 
+    @validator("amount_max")
+    def amount_max_not_less_than_min(
+            cls,
+            amount_max: decimal.Decimal | None,
+            values: dict[str, Any]
+    ) -> decimal.Decimal | None:
+        amount_min = values.get("amount_min")
+        if amount_max is not None and amount_min is not None and amount_max < amount_min:
+            raise ValueError("Max amount is less than min amount")
+        return amount_max
+
 
 class TitleSearchModel(Base):
     name: str | None = None
@@ -263,10 +310,25 @@ class EmployeeSearchModel(Base):
     name: str | None = None
     surname: str | None = None
     patronymic: str | None = None
+    name_match: NameMatchMode = "exact"
     department_number: int | None = None
     service_number: int | None = None
     employment_date: datetime.date | None = None
+    employment_date_min: datetime.date | None = None
+    employment_date_max: datetime.date | None = None
     topic: TopicSearchModel | None
     post: PostSearchModel | None
     salary: SalarySearchModel | None
     titles: list[TitleSearchModel] | None
+
+    @validator("employment_date_max")
+    def employment_date_max_not_less_than_min(
+            cls,
+            employment_date_max: datetime.date | None,
+            values: dict[str, Any]
+    ) -> datetime.date | None:
+        employment_date_min = values.get("employment_date_min")
+        if employment_date_max is not None and employment_date_min is not None \
+                and employment_date_max < employment_date_min:
+            raise ValueError("Max employment date is less than min employment date")
+        return employment_date_max
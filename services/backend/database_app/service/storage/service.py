@@ -1,7 +1,16 @@
+import csv
+import datetime
+import io
+import json
+from typing import Any, AsyncIterator, Hashable, Literal
+
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from . import schema, crud
-from .exceptions import EmployeeIDDoesntExist
+from . import schema, models, crud, cache, pagination, utils
+from .exceptions import EmployeeIDDoesntExist, InvalidCursor
+from ...schema import ErrorInfo, CacheStats
+from ...cache import get_data_version, bump_data_version_after_commit
 
 
 async def is_service_number_available_to_employee(
@@ -10,10 +19,10 @@ async def is_service_number_available_to_employee(
         employee_id: int
      ) -> bool:
 
-    employee = await get_employee(db, employee_id)
-    if not employee:
+    employee_service_number = await crud.get_employee_service_number(db, employee_id)
+    if employee_service_number is None:
         raise EmployeeIDDoesntExist
-    is_employee_are_number_owner = employee.service_number == service_number
+    is_employee_are_number_owner = employee_service_number == service_number
     is_service_number_free = not await crud.is_service_number_occupied(db, service_number)
     return is_service_number_free or is_employee_are_number_owner
 
@@ -26,11 +35,85 @@ async def is_employee_id_exist(db: AsyncSession, employee_id: int) -> bool:
     return await crud.is_employee_id_exist(db, employee_id)
 
 
+async def warm_up_lookups_cache(db: AsyncSession) -> None:
+    await crud.warm_up_lookups_cache(db)
+
+
+async def store_currency_rates(db: AsyncSession) -> None:
+    """
+    Store USD prices of all currencies from exchange rates snapshot.
+    Runs after every snapshot refresh, so read endpoints never write rates.
+    Rate is NULL if currency is unknown or rates aren't fetched yet.
+    New currencies get their rate on creation, see crud.get_or_create_currencies
+    """
+
+    rates = {
+        currency_id: utils.get_usd_rate(currency_name)
+        for currency_id, currency_name in (await crud.get_currencies(db)).items()
+    }
+    await crud.set_currency_rates(db, rates)
+    bump_data_version_after_commit(db)
+    await db.commit()
+
+
 async def create_employee(db: AsyncSession, employee_in: schema.EmployeeIn) -> schema.Employee:
     db_employee = await crud.create_employee(db, employee_in)
     return schema.Employee.from_orm(db_employee)
 
 
+async def create_employees(db: AsyncSession, employees_data: list[Any]) -> schema.EmployeesBulkCreateOut:
+    errors: list[ErrorInfo] = []
+    employees_in: dict[int, schema.EmployeeIn] = {}
+
+    for row, employee_data in enumerate(employees_data):
+        try:
+            employees_in[row] = schema.EmployeeIn.parse_obj(employee_data)
+        except ValidationError as err:
+            for err_info in err.errors():
+                errors.append(ErrorInfo(loc=["body", row, *err_info["loc"]], msg=err_info["msg"], type_=err_info["type"]))
+
+    occupied_service_numbers = await crud.get_occupied_service_numbers(
+        db,
+        {i.service_number for i in employees_in.values()}
+    )
+    for row, employee_in in list(employees_in.items()):
+        if employee_in.service_number in occupied_service_numbers:
+            errors.append(ErrorInfo(
+                loc=["body", row, "service_number"],
+                msg="Employee service number must be unique",
+                type_="value_error.not_unique"
+            ))
+            del employees_in[row]
+        else:
+            occupied_service_numbers.add(employee_in.service_number)
+
+    topics_ids = await crud.get_or_create_topics(db, {i.topic for i in employees_in.values()})
+    posts_ids = await crud.get_or_create_posts(db, {i.post for i in employees_in.values()})
+    for row, employee_in in list(employees_in.items()):
+        if employee_in.topic not in topics_ids:
+            errors.append(ErrorInfo(
+                loc=["body", row, "topic"],
+                msg="Topic name or number is occupied by another topic",
+                type_="value_error.not_unique"
+            ))
+        if employee_in.post not in posts_ids:
+            errors.append(ErrorInfo(
+                loc=["body", row, "post"],
+                msg="Post name is occupied by post with another code",
+                type_="value_error.not_unique"
+            ))
+        if employee_in.topic not in topics_ids or employee_in.post not in posts_ids:
+            del employees_in[row]
+
+    created_employees_ids = await crud.create_employees(db, list(employees_in.values()), topics_ids, posts_ids)
+
+    employees_ids: list[int | None] = [None] * len(employees_data)
+    for row, employee_id in zip(employees_in, created_employees_ids):
+        employees_ids[row] = employee_id
+
+    return schema.EmployeesBulkCreateOut(employees_ids=employees_ids, errors=errors)
+
+
 async def get_employee(db: AsyncSession, employee_id: int) -> schema.Employee | None:
     db_employee = await crud.get_employee(db, employee_id)
     if db_employee is None:
@@ -38,8 +121,72 @@ async def get_employee(db: AsyncSession, employee_id: int) -> schema.Employee |
     return schema.Employee.from_orm(db_employee)
 
 
-async def get_employees(db: AsyncSession, skip: int, limit: int) -> list[schema.Employee]:
-    db_employees = await crud.get_employees(db, skip, limit)
+def parse_employees_cursor(cursor: str, sort_by: schema.EmployeesSearchSortKey) -> list[Any]:
+    """
+    :return: Sort columns values of the last employee of the previous page
+    """
+
+    last_values = pagination.decode_cursor(cursor, sort_by)
+    try:
+        if sort_by == "employment_date":
+            employment_date, employee_id = last_values
+            return [datetime.date.fromisoformat(employment_date), int(employee_id)]
+
+        if sort_by == "relevance":
+            negated_search_rank, employee_id = last_values
+            return [float(negated_search_rank), int(employee_id)]
+
+        employee_id, = last_values
+        return [int(employee_id)]
+
+    except (TypeError, ValueError) as err:
+        raise InvalidCursor("Cursor is malformed") from err
+
+
+def make_employees_page(
+        db_employees: list[models.Employee],
+        limit: int,
+        sort_by: schema.EmployeesSearchSortKey
+) -> tuple[list[schema.Employee], str | None]:
+    """
+    :param db_employees: Employees of the page and one more employee, if the next page exists
+    :return: Employees of the page and cursor of the next page
+    """
+
+    next_cursor = None
+    if len(db_employees) > limit:
+        db_employees = db_employees[:limit]
+        last_employee = db_employees[-1]
+        last_values: list[Any] = [last_employee.id]
+        if sort_by == "employment_date":
+            last_values = [last_employee.employment_date, last_employee.id]
+        elif sort_by == "relevance":
+            assert last_employee.search_rank is not None
+            last_values = [-last_employee.search_rank, last_employee.id]
+        next_cursor = pagination.encode_cursor(sort_by, last_values)
+
+    return [schema.Employee.from_orm(db_emp) for db_emp in db_employees], next_cursor
+
+
+async def get_employees(
+        db: AsyncSession,
+        limit: int,
+        sort_by: schema.EmployeesSortKey = "id",
+        cursor: str | None = None
+) -> schema.EmployeesPage:
+    after = None
+    if cursor is not None:
+        after = parse_employees_cursor(cursor, sort_by)
+
+    # One extra employee is fetched to know whether the next page exists
+    db_employees = await crud.get_employees(db, limit + 1, sort_by, after)
+    employees, next_cursor = make_employees_page(db_employees, limit, sort_by)
+
+    return schema.EmployeesPage(employees=employees, next_cursor=next_cursor)
+
+
+async def get_employees_by_offset(db: AsyncSession, skip: int, limit: int) -> list[schema.Employee]:
+    db_employees = await crud.get_employees_by_offset(db, skip, limit)
     return [schema.Employee.from_orm(db_emp) for db_emp in db_employees]
 
 
@@ -53,8 +200,109 @@ async def get_all_employees(db: AsyncSession) -> list[schema.Employee]:
     return [schema.Employee.from_orm(db_emp) for db_emp in db_employees]
 
 
-async def update_employee(db: AsyncSession, employee_in: schema.EmployeeIn, employee_id: int) -> schema.Employee:
+EMPLOYEES_CSV_HEADER = (
+    "id",
+    "name",
+    "surname",
+    "patronymic",
+    "department_number",
+    "service_number",
+    "employment_date",
+    "topic_name",
+    "topic_number",
+    "post_name",
+    "post_code",
+    "salary_amount",
+    "salary_currency",
+    "titles",
+)
+
+
+def employee_to_export_dict(db_employee: models.Employee) -> dict[str, Any]:
+    """
+    Same shape as schema.Employee. Data read from DB is already valid, so pydantic validation is skipped -
+    it costs more than the whole DB read
+    """
+
+    return {
+        "id": db_employee.id,
+        "name": db_employee.name,
+        "surname": db_employee.surname,
+        "patronymic": db_employee.patronymic,
+        "department_number": db_employee.department_number,
+        "service_number": db_employee.service_number,
+        "employment_date": db_employee.employment_date.isoformat(),
+        "topic": {"id": db_employee.topic.id, "name": db_employee.topic.name, "number": db_employee.topic.number},
+        "post": {"id": db_employee.post.id, "name": db_employee.post.name, "code": db_employee.post.code},
+        "salary": {
+            "id": db_employee.salary.id,
+            "amount": float(db_employee.salary.amount),
+            "currency": {"id": db_employee.salary.currency.id, "name": db_employee.salary.currency.name},
+        },
+        "titles": [{"id": title.id, "name": title.name} for title in db_employee.titles],
+    }
+
+
+def employee_to_csv_row(db_employee: models.Employee) -> tuple[Any, ...]:
+    return (
+        db_employee.id,
+        db_employee.name,
+        db_employee.surname,
+        db_employee.patronymic,
+        db_employee.department_number,
+        db_employee.service_number,
+        db_employee.employment_date.isoformat(),
+        db_employee.topic.name,
+        db_employee.topic.number,
+        db_employee.post.name,
+        db_employee.post.code,
+        db_employee.salary.amount,
+        db_employee.salary.currency.name,
+        ";".join(title.name for title in db_employee.titles),
+    )
+
+
+async def export_employees(
+        db: AsyncSession,
+        export_format: Literal["ndjson", "csv"],
+        batch_size: int = 1000
+) -> AsyncIterator[str]:
+    """
+    :return: Chunks of exported employees. Each chunk contains at most batch_size employees
+    """
+
+    buffer = io.StringIO()
+    csv_writer = csv.writer(buffer)
+    if export_format == "csv":
+        csv_writer.writerow(EMPLOYEES_CSV_HEADER)
+
+    rows_in_buffer = 0
+    async for db_employee in crud.stream_all_employees(db, batch_size):
+        if export_format == "csv":
+            csv_writer.writerow(employee_to_csv_row(db_employee))
+        else:
+            buffer.write(json.dumps(employee_to_export_dict(db_employee)))
+            buffer.write("\n")
+
+        rows_in_buffer += 1
+        if rows_in_buffer >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            rows_in_buffer = 0
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+async def update_employee(
+        db: AsyncSession,
+        employee_in: schema.EmployeeIn,
+        employee_id: int
+) -> schema.Employee | None:
     db_employee = await crud.update_employee(db, employee_in, employee_id)
+    if db_employee is None:
+        return None
     return schema.Employee.from_orm(db_employee)
 
 
@@ -65,6 +313,55 @@ async def delete_employee(db: AsyncSession, employee_id: int) -> schema.Employee
     return schema.Employee.from_orm(db_employee)
 
 
-async def search_employees(db: AsyncSession, search_model: schema.EmployeeSearchModel) -> list[schema.Employee]:
-    db_employees = await crud.search_employees(db, search_model)
-    return [schema.Employee.from_orm(i) for i in db_employees]
+async def delete_employees(db: AsyncSession, employees_ids: list[int]) -> list[int]:
+    return await crud.delete_employees(db, employees_ids)
+
+
+def get_search_cache_key(
+        search_model: schema.EmployeeSearchModel,
+        *args: Hashable
+) -> Hashable:
+    """
+    Searches with the same titles in different order or with duplicates get the same key.
+    Key includes data version, so results found before any employee changed are never hit
+    """
+
+    titles_names = None
+    if search_model.titles:
+        titles_names = tuple(sorted({title.name for title in search_model.titles if title.name is not None}))
+    return search_model.copy(update={"titles": None}), titles_names, *args, get_data_version()
+
+
+async def search_employees(
+        db: AsyncSession,
+        search_model: schema.EmployeeSearchModel,
+        limit: int,
+        sort_by: schema.EmployeesSearchSortKey = "id",
+        cursor: str | None = None,
+        with_total_count: bool = False
+) -> schema.EmployeesSearchPage:
+    search_results_cache = cache.get_search_results_cache()
+    # Key is taken before reading, so results of reading concurrent with employees change are never hit
+    cache_key = get_search_cache_key(search_model, limit, sort_by, cursor, with_total_count)
+    employees_page = search_results_cache.get(cache_key)
+    if employees_page is not None:
+        return employees_page
+
+    after = None
+    if cursor is not None:
+        after = parse_employees_cursor(cursor, sort_by)
+
+    db_employees = await crud.search_employees(db, search_model, limit + 1, sort_by, after)
+    employees, next_cursor = make_employees_page(db_employees, limit, sort_by)
+
+    total_count = None
+    if with_total_count:
+        total_count = await crud.count_employees(db, search_model)
+
+    employees_page = schema.EmployeesSearchPage(employees=employees, next_cursor=next_cursor, total_count=total_count)
+    search_results_cache.set(cache_key, employees_page)
+    return employees_page
+
+
+def get_search_cache_stats() -> CacheStats:
+    return cache.get_search_results_cache().get_stats()
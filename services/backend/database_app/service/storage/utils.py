@@ -1,8 +1,15 @@
+import asyncio
 import decimal
+import json
+import logging
+import os
+import time
 from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Awaitable, Callable
 
-from aiohttp import ClientSession
-from async_lru import alru_cache
+from aiohttp import ClientSession, ClientError
+from sqlalchemy.exc import SQLAlchemyError
 
 from ...config import get_settings
 from . import schema
@@ -140,23 +147,23 @@ currencies = {
 #  'timestamp': 1688728803
 #  }
 
-@alru_cache(ttl=3600)
-async def get_currency_course(
-        first_currency: str,
-        second_currency: str,
-) -> decimal.Decimal:
+logger = logging.getLogger(__name__)
+
+# Failures of rates fetching, after which previous snapshot is kept
+REFRESH_ERRORS = (ClientError, OSError, ValueError, asyncio.TimeoutError)
+
+# Failures of refresh callbacks, which are logged and don't stop refresh
+REFRESH_CALLBACK_ERRORS = (SQLAlchemyError, OSError)
+
+
+async def fetch_exchange_rates() -> dict[str, Any]:
     """
-    :param first_currency:
-    :param second_currency:
-    :return: Exchange course for currency to another_currency. If one of currency unknown - return 0
+    :return: Exchange rates api JSON response with rates of all currencies
     """
 
-    assert len(first_currency) == 3
-    assert len(second_currency) == 3
-
     exchange_api_access_key = get_settings().currency_exchange_rates.api_key
     if __debug__ or not exchange_api_access_key:
-        response_json = {
+        return {
             'base': 'EUR',
             'date': '2023-07-07',
             'rates': {
@@ -200,29 +207,188 @@ async def get_currency_course(
             'timestamp': 1688738643
         }
 
-    else:
-        api_url = get_settings().currency_exchange_rates.api_url
-        params = {
-            "access_key": exchange_api_access_key,
-            "symbols": ",".join((first_currency, second_currency))
-        }
+    api_url = get_settings().currency_exchange_rates.api_url
+    params = {
+        "access_key": exchange_api_access_key,
+    }
+
+    async with ClientSession() as session:
+        async with session.get(rf"{api_url}/latest", params=params) as response:
+            response_json = await response.json()
+            if not isinstance(response_json, dict):
+                raise exceptions.ExchangeRatesAPIWrongJson("exchangeratesapi.io json response has wrong schema")
+
+            is_success = response_json.get("success", None)
+            if not (200 <= response.status < 300) or not is_success:
+                raise exceptions.ExchangeRatesAPIError(f"Status code is {response.status}, success: {is_success}")
+
+    return response_json
+
+
+class ExchangeRates:
+    """
+    Snapshot of all currencies rates, shared by all conversions.
+
+    Snapshot is refreshed in background before it becomes older than rates TTL, and stale snapshot is served
+    while refresh fails. Every snapshot is saved to disk and loaded on start, so restart doesn't wait for API.
+    Refresh callbacks run after every new snapshot, e.g. to store rates in database
+    """
+
+    def __init__(self, snapshot_path: str, ttl: float, refresh_margin: float) -> None:
+        """
+        :param ttl: Seconds snapshot stays fresh
+        :param refresh_margin: Seconds before snapshot expiration when refresh starts
+        """
+
+        self.snapshot_path = snapshot_path
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.rates: dict[str, Decimal] = {}
+        self.fetched_at: float | None = None
+        self.refresh_callbacks: list[Callable[[], Awaitable[None]]] = []
+        self._refresh_task: asyncio.Task[None] | None = None
+
+    def get_course(self, first_currency: str, second_currency: str) -> Decimal:
+        """
+        :return: Exchange course for first_currency to second_currency
+        """
+
+        if self.fetched_at is None:
+            raise exceptions.ExchangeRatesAPIError("Exchange rates aren't fetched yet")
+
+        try:
+            first_curr_to_base = self.rates[first_currency]
+            second_curr_to_base = self.rates[second_currency]
+        except KeyError:
+            raise exceptions.ExchangeRatesUnknownCurrency("Currency name is unknown")
+
+        return Decimal(1) / first_curr_to_base * second_curr_to_base
+
+    def set_snapshot(self, response_json: dict[str, Any], fetched_at: float) -> None:
+        if not isinstance(response_json.get("rates"), dict):
+            raise exceptions.ExchangeRatesAPIWrongJson("exchangeratesapi.io json response has not 'rates' dict")
+
+        try:
+            # Zero rate can't be converted from
+            rates = {name: Decimal(rate) for name, rate in response_json["rates"].items() if rate}
+        except (TypeError, ValueError, decimal.InvalidOperation) as err:
+            raise exceptions.ExchangeRatesAPIWrongJson(
+                f"exchangeratesapi.io json response has wrong rate: {err!r}"
+            ) from err
 
-        async with ClientSession() as session:
-            async with session.get(rf"{api_url}/latest" , params=params) as response:
-                response_json = await response.json()
-                if not isinstance(response_json, dict):
-                    raise exceptions.ExchangeRatesAPIWrongJson("exchangeratesapi.io json response has wrong schema")
+        if not all(rate.is_finite() and rate > 0 for rate in rates.values()):
+            raise exceptions.ExchangeRatesAPIWrongJson("exchangeratesapi.io json response has not finite positive rate")
 
-                is_success = response_json.get("success", None)
-                if not (200 <= response.status < 300) or not is_success:
-                    raise exceptions.ExchangeRatesAPIError(f"Status code is {response.status}, success: {is_success}")
+        self.rates = rates
+        self.fetched_at = fetched_at
 
-    if not isinstance(response_json["rates"], dict):
-        raise exceptions.ExchangeRatesAPIWrongJson("exchangeratesapi.io json response has not 'rates' dict")
+    def load_snapshot(self) -> None:
+        try:
+            with open(self.snapshot_path) as file:
+                snapshot = json.load(file)
+            self.set_snapshot(snapshot["response"], snapshot["fetched_at"])
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError, decimal.InvalidOperation) as err:
+            logger.warning("Exchange rates snapshot isn't loaded from %s: %r", self.snapshot_path, err)
+
+    def save_snapshot(self, response_json: dict[str, Any], fetched_at: float) -> None:
+        temp_path = f"{self.snapshot_path}.tmp"
+        try:
+            with open(temp_path, "w") as file:
+                json.dump({"fetched_at": fetched_at, "response": response_json}, file)
+            os.replace(temp_path, self.snapshot_path)
+        except OSError as err:
+            logger.warning("Exchange rates snapshot isn't saved to %s: %r", self.snapshot_path, err)
+
+    async def refresh(self) -> None:
+        response_json = await fetch_exchange_rates()
+        fetched_at = time.time()
+        self.set_snapshot(response_json, fetched_at)
+        self.save_snapshot(response_json, fetched_at)
+        await self.run_refresh_callbacks()
+
+    async def run_refresh_callbacks(self) -> None:
+        for callback in self.refresh_callbacks:
+            try:
+                await callback()
+            except REFRESH_CALLBACK_ERRORS as err:
+                logger.warning("Exchange rates refresh callback failed: %r", err)
+
+    def get_refresh_delay(self) -> float:
+        if self.fetched_at is None:
+            return 0
+        return max(self.fetched_at + self.ttl - self.refresh_margin - time.time(), 0)
+
+    async def refresh_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.get_refresh_delay())
+            try:
+                await self.refresh()
+            except REFRESH_ERRORS as err:
+                logger.warning("Exchange rates aren't refreshed: %r", err)
+                await asyncio.sleep(self.refresh_margin / 10)
+            except Exception:
+                # Unexpected error mustn't stop refresh until restart, stale rates would be served forever
+                logger.exception("Exchange rates refresh failed")
+                await asyncio.sleep(self.refresh_margin / 10)
+
+    async def start(self) -> None:
+        """
+        Load snapshot from disk, fetch rates only if there is no snapshot, and start background refresh
+        """
+
+        self.load_snapshot()
+        if self.fetched_at is None:
+            try:
+                await self.refresh()
+            except REFRESH_ERRORS as err:
+                logger.warning("Exchange rates aren't fetched: %r", err)
+        else:
+            await self.run_refresh_callbacks()
+
+        self._refresh_task = asyncio.create_task(self.refresh_periodically())
+
+    async def stop(self) -> None:
+        if self._refresh_task is None:
+            return
+
+        self._refresh_task.cancel()
+        try:
+            await self._refresh_task
+        except asyncio.CancelledError:
+            pass
+        self._refresh_task = None
+
+
+@lru_cache
+def get_exchange_rates() -> ExchangeRates:
+    settings = get_settings().currency_exchange_rates
+    return ExchangeRates(settings.snapshot_path, settings.rates_ttl, settings.refresh_margin)
+
+
+def get_currency_course(
+        first_currency: str,
+        second_currency: str,
+) -> decimal.Decimal:
+    """
+    :param first_currency:
+    :param second_currency:
+    :return: Exchange course for currency to another_currency
+    """
+
+    assert len(first_currency) == 3
+    assert len(second_currency) == 3
+
+    return get_exchange_rates().get_course(first_currency, second_currency)
+
+
+def get_usd_rate(currency: str) -> decimal.Decimal | None:
+    """
+    :return: Price of currency unit in USD, None if currency is unknown or rates aren't fetched yet
+    """
 
     try:
-        first_curr_to_euro = Decimal(response_json["rates"][first_currency])
-        second_curr_to_euro = Decimal(response_json["rates"][second_currency])
-        return Decimal(1) / first_curr_to_euro * second_curr_to_euro
-    except KeyError:
-        raise exceptions.ExchangeRatesUnknownCurrency("Currency name is unknown")
+        return get_currency_course(currency, "USD")
+    except exceptions.ExchangeRatesError:
+        return None
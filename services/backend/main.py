@@ -3,11 +3,16 @@ from fastapi import FastAPI
 from database_app.service.storage.router import router as storage_router
 from database_app.service.statistics.router import router as statistics_router
 from database_app.service.forecasts.router import router as forecasts_router
+from database_app.service.storage import service as storage_service
+from database_app.service.storage import utils as storage_utils
+from database_app.service.forecasts import pool as forecasts_pool
 from database_app.dependencies import get_db, get_db_stub
 from database_app.service.storage.exceptions import EmployeeServiceNumberNotUnique, \
-    EmployeeIDDoesntExist
+    EmployeeIDDoesntExist, EmployeeTopicNotUnique, EmployeePostNotUnique, InvalidCursor, \
+    EmployeesBulkTooLarge
 from database_app.service.storage.exceptions_handlers import employee_service_number_not_unique_handler, \
-    employee_id_doesnt_exist_handler
+    employee_id_doesnt_exist_handler, employee_topic_not_unique_handler, employee_post_not_unique_handler, \
+    invalid_cursor_handler, employees_bulk_too_large_handler
 
 
 app = FastAPI()
@@ -18,5 +23,37 @@ app.include_router(forecasts_router)
 
 app.add_exception_handler(EmployeeServiceNumberNotUnique, employee_service_number_not_unique_handler)
 app.add_exception_handler(EmployeeIDDoesntExist, employee_id_doesnt_exist_handler)
+app.add_exception_handler(EmployeeTopicNotUnique, employee_topic_not_unique_handler)
+app.add_exception_handler(EmployeePostNotUnique, employee_post_not_unique_handler)
+app.add_exception_handler(InvalidCursor, invalid_cursor_handler)
+app.add_exception_handler(EmployeesBulkTooLarge, employees_bulk_too_large_handler)
 
 app.dependency_overrides[get_db_stub] = get_db
+
+
+@app.on_event("startup")
+async def warm_up_lookups_cache() -> None:
+    async for db in get_db():
+        await storage_service.warm_up_lookups_cache(db)
+
+
+async def store_currency_rates() -> None:
+    async for db in get_db():
+        await storage_service.store_currency_rates(db)
+
+
+@app.on_event("startup")
+async def start_exchange_rates_refresh() -> None:
+    exchange_rates = storage_utils.get_exchange_rates()
+    exchange_rates.refresh_callbacks.append(store_currency_rates)
+    await exchange_rates.start()
+
+
+@app.on_event("shutdown")
+async def stop_exchange_rates_refresh() -> None:
+    await storage_utils.get_exchange_rates().stop()
+
+
+@app.on_event("shutdown")
+def shutdown_forecasts_process_pool() -> None:
+    forecasts_pool.shutdown_process_pool()
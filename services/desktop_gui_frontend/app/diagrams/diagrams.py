@@ -1,11 +1,11 @@
 import datetime
-from collections import Counter
 
 from dateutil import relativedelta
 from matplotlib.figure import Figure  # type: ignore
 from matplotlib import pyplot as plt  # type: ignore
 
 from ..service.storage import schema
+from ..service.statistics import schema as statistics_schema
 
 
 class DiagramsFactory:
@@ -95,12 +95,7 @@ class DiagramsFactory:
 
         return figure
 
-    def create_employees_distribution_by_titles_diagram(self, employees: list[schema.Employee]) -> Figure:
-        emps_count_per_title: Counter[str] = Counter()
-        for emp in employees:
-            for title in emp.titles:
-                emps_count_per_title[title.name] += 1
-
+    def create_employees_distribution_by_titles_diagram(self, emps_count_per_title: dict[str, int]) -> Figure:
         figure, ax = plt.subplots(figsize=(
             20,
             10
@@ -121,11 +116,7 @@ class DiagramsFactory:
 
         return figure
 
-    def create_employees_distribution_by_topics_diagram(self, employees: list[schema.Employee]) -> Figure:
-        emps_count_per_topic: Counter[str] = Counter()
-        for emp in employees:
-            emps_count_per_topic[emp.topic.name] += 1
-
+    def create_employees_distribution_by_topics_diagram(self, emps_count_per_topic: dict[str, int]) -> Figure:
         figure, ax = plt.subplots(figsize=(
             20,
             10
@@ -145,3 +136,32 @@ class DiagramsFactory:
             ax.annotate(emps_count, xy=(i, emps_count))
 
         return figure
+
+    def create_employees_tenure_distribution_diagram(
+            self,
+            tenure_histogram: statistics_schema.TenureHistogram,
+            tenure_percentiles: statistics_schema.TenurePercentiles
+    ) -> Figure:
+        figure, ax = plt.subplots(figsize=(
+            20,
+            10
+        ), layout='constrained')
+
+        buckets = tenure_histogram.buckets
+        ax.bar(
+            [bucket.min_months for bucket in buckets],
+            [bucket.employees_count for bucket in buckets],
+            width=[bucket.max_months - bucket.min_months for bucket in buckets],
+            align="edge",
+            edgecolor="black"
+        )
+        ax.set_xlabel("Work duration in months")
+        ax.set_ylabel("Employees count")
+
+        for percentile_name, months in tenure_percentiles.dict().items():
+            if months is None:
+                continue
+            ax.axvline(months, color="red", linestyle="--")
+            ax.annotate(f"{percentile_name}: {months:g}", xy=(months, 0), rotation=90, va="bottom")
+
+        return figure
@@ -7,6 +7,7 @@ from matplotlib.figure import Figure  # type: ignore
 from app.service.forecasts.exceptions import WrongForecastsData
 from app.service.statistics.exceptions import WrongStatisticsData
 from app.service.storage import schema
+from app.service.statistics import schema as statistics_schema
 from app.service.exceptions import ServiceError, WrongData
 from app.service import StorageService, StatisticsService, ForecastsService
 from app.diagrams.diagrams import DiagramsFactory
@@ -18,6 +19,42 @@ from app.gui import events
 from app.gui import elements
 
 
+TENURE_HISTOGRAM_BUCKETS_COUNT = 20
+
+EMPLOYEES_PAGE_SIZE = 100
+
+
+def get_statistics_window_reports(
+        statistics_service: StatisticsService,
+        statistics_window: "windows.StatisticsWindow"
+) -> "windows.StatisticsWindowReports":
+    """
+    Reports of statistics window that need no input are fetched in one batch
+    and reused by its buttons until employees change
+    """
+
+    reports = statistics_window.reports
+    if reports is not None:
+        return reports
+
+    facets_report, histogram_report, percentiles_report = statistics_service.get_statistics_batch([
+        statistics_schema.FacetsReportIn(),
+        statistics_schema.TenureHistogramReportIn(buckets_count=TENURE_HISTOGRAM_BUCKETS_COUNT),
+        statistics_schema.TenurePercentilesReportIn(),
+    ]).reports
+    assert isinstance(facets_report, statistics_schema.FacetsReport)
+    assert isinstance(histogram_report, statistics_schema.TenureHistogramReport)
+    assert isinstance(percentiles_report, statistics_schema.TenurePercentilesReport)
+
+    reports = windows.StatisticsWindowReports(
+        facets=facets_report.facets,
+        tenure_histogram=histogram_report.histogram,
+        tenure_percentiles=percentiles_report.percentiles,
+    )
+    statistics_window.reports = reports
+    return reports
+
+
 class Command(ABC):
     def __init__(self, commands_history: "history.CommandsHistory") -> None:
         self.commands_history = commands_history
@@ -222,10 +259,10 @@ class DeleteEmployees(Command):
             ServiceError,
             suppress_exception=True
         )
-        def operation() -> list[schema.Employee]:
-            deleted_employees = self.storage_service.delete_employees(selected_employees_ids)
+        def operation() -> list[int]:
+            deleted_employees_ids = self.storage_service.delete_employees(selected_employees_ids)
             self.commands_history.add_command(self.copy())
-            return deleted_employees
+            return deleted_employees_ids
 
         self.deleted_employees = selected_employees
         self.event_window = event_window
@@ -286,8 +323,8 @@ class RefreshEmployeesTable(Command):
             ServiceError,
             suppress_exception=True
         )
-        def operation() -> list[schema.Employee]:
-            return self.storage_service.get_employees(0, 99999)
+        def operation() -> schema.EmployeesPage:
+            return self.storage_service.get_employees(EMPLOYEES_PAGE_SIZE)
 
         event_window.perform_long_operation(operation, events.EmployeeEvent.SHOW_EMPLOYEES)
 
@@ -297,8 +334,55 @@ class ShowEmployees(Command):
         if not isinstance(event_window, windows.MainWindow):
             return
 
-        employees = values[events.EmployeeEvent.SHOW_EMPLOYEES]
-        event_window.update_employees_table(employees)
+        employees_page = values[events.EmployeeEvent.SHOW_EMPLOYEES]
+        if employees_page is None:
+            return
+
+        event_window.update_employees_table(employees_page)
+
+
+class LoadMoreEmployees(Command):
+    def __init__(self, storage_service: StorageService, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.storage_service = storage_service
+
+    def __call__(self, event_window: "windows.AppWindow", values: dict[Key, Any]) -> None:
+        if not isinstance(event_window, windows.MainWindow):
+            return
+
+        cursor = event_window.employees_next_cursor
+        if cursor is None:
+            return
+
+        @events.raise_status_events(
+            event_window,
+            events.OperationStatus.SUCCESS,
+            events.OperationStatus.PROCESSING,
+            events.OperationStatus.FAILED,
+            ServiceError,
+            suppress_exception=True
+        )
+        def operation() -> tuple[str, schema.EmployeesPage]:
+            return cursor, self.storage_service.get_employees(EMPLOYEES_PAGE_SIZE, cursor)
+
+        event_window.perform_long_operation(operation, events.EmployeeEvent.SHOW_MORE_EMPLOYEES)
+
+
+class ShowMoreEmployees(Command):
+    def __call__(self, event_window: "windows.AppWindow", values: dict[Key, Any]) -> None:
+        if not isinstance(event_window, windows.MainWindow):
+            return
+
+        loaded_page = values[events.EmployeeEvent.SHOW_MORE_EMPLOYEES]
+        if loaded_page is None:
+            return
+
+        cursor, employees_page = loaded_page
+        # Table was refreshed while the page was loaded, so the page doesn't continue it
+        if cursor != event_window.employees_next_cursor:
+            return
+
+        event_window.extend_employees_table(employees_page)
 
 
 class ShowWrongData(Command):
@@ -368,7 +452,7 @@ class SearchEmployees(Command):
             suppress_exception=True
         )
         def operation() -> list[schema.Employee]:
-            return self.storage_service.search_employees(search_model)
+            return self.storage_service.search_all_employees(search_model)
 
         event_window.perform_long_operation(operation, events.EmployeeEvent.SELECT_EMPLOYEES)
 
@@ -426,7 +510,11 @@ class ShowMaxWorkDuration(Command):
             suppress_exception=True
         )
         def operation() -> list[schema.Employee]:
-            return self.statistics_service.get_max_work_duration_employees(employees_count)
+            report, = self.statistics_service.get_statistics_batch([
+                statistics_schema.WorkLongestEmployeesReportIn(employees_count=employees_count)
+            ]).reports
+            assert isinstance(report, statistics_schema.EmployeesReport)
+            return report.employees
 
         event_window.perform_long_operation(operation, events.StatisticsEvent.SHOW_MAX_WORK_DURATION_DIAGRAM)
 
@@ -480,7 +568,11 @@ class ShowHighestPaidEmployees(Command):
             suppress_exception=True
         )
         def operation() -> list[schema.Employee]:
-            return self.statistics_service.get_max_work_duration_employees(employees_count)
+            report, = self.statistics_service.get_statistics_batch([
+                statistics_schema.HighestPaidEmployeesReportIn(employees_count=employees_count)
+            ]).reports
+            assert isinstance(report, statistics_schema.EmployeesReport)
+            return report.employees
 
         event_window.perform_long_operation(operation, events.StatisticsEvent.SHOW_HIGHEST_PAID_EMPLOYEES_DIAGRAM)
 
@@ -534,7 +626,11 @@ class ShowTitleEmployeesGrowthHistory(Command):
             suppress_exception=True
         )
         def operation() -> dict[int, int]:
-            growth_history = self.statistics_service.get_title_employees_history_growth(title_name)
+            report, = self.statistics_service.get_statistics_batch([
+                statistics_schema.TitlesGrowthHistoryReportIn(titles=[schema.TitleIn(name=title_name)])
+            ]).reports
+            assert isinstance(report, statistics_schema.TitlesGrowthHistoryReport)
+            growth_history, = report.titles.values()
             if not growth_history:
                 raise WrongStatisticsData(errors_places=[("-TITLE-EMPLOYEES-GROWTH-HISTORY-TITLE-NAME-",)])
             return growth_history
@@ -558,11 +654,14 @@ class ShowTitleEmployeesGrowthHistoryDiagram(Command):
 
 
 class ShowEmployeesDistributionByTitles(Command):
-    def __init__(self, storage_service: StorageService, *args: Any, **kwargs: Any) -> None:
+    def __init__(self, statistics_service: StatisticsService, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
-        self.storage_service = storage_service
+        self.statistics_service = statistics_service
 
     def __call__(self, event_window: "windows.AppWindow", values: dict[Key, Any]) -> None:
+        if not isinstance(event_window, windows.StatisticsWindow):
+            return
+
         @events.raise_status_events(
             event_window,
             events.OperationStatus.SUCCESS,
@@ -571,8 +670,8 @@ class ShowEmployeesDistributionByTitles(Command):
             handle_exception_type=ServiceError,
             suppress_exception=True
         )
-        def operation() -> list[schema.Employee]:
-            return self.storage_service.get_employees(0, 999999999999)
+        def operation() -> dict[str, int]:
+            return get_statistics_window_reports(self.statistics_service, event_window).facets.titles
 
         event_window.perform_long_operation(
             operation,
@@ -586,21 +685,24 @@ class ShowEmployeesDistributionByTitlesDiagram(Command):
         self.diagrams_factory = diagrams_factory
 
     def __call__(self, event_window: "windows.AppWindow", values: dict[Key, Any]) -> None:
-        employees = values[events.StatisticsEvent.SHOW_EMPLOYEES_DISTRIBUTION_BY_TITLES_DIAGRAM]
-        if employees is None:
+        emps_count_per_title = values[events.StatisticsEvent.SHOW_EMPLOYEES_DISTRIBUTION_BY_TITLES_DIAGRAM]
+        if emps_count_per_title is None:
             return
 
-        diagram = self.diagrams_factory.create_employees_distribution_by_titles_diagram(employees)
+        diagram = self.diagrams_factory.create_employees_distribution_by_titles_diagram(emps_count_per_title)
         diagram_window = event_window.parent_gui.create_diagram_window("Employees distribution by titles")
         diagram_window.draw_diagram(diagram)
 
 
 class ShowEmployeesDistributionByTopics(Command):
-    def __init__(self, storage_service: StorageService, *args: Any, **kwargs: Any) -> None:
+    def __init__(self, statistics_service: StatisticsService, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
-        self.storage_service = storage_service
+        self.statistics_service = statistics_service
 
     def __call__(self, event_window: "windows.AppWindow", values: dict[Key, Any]) -> None:
+        if not isinstance(event_window, windows.StatisticsWindow):
+            return
+
         @events.raise_status_events(
             event_window,
             events.OperationStatus.SUCCESS,
@@ -609,8 +711,8 @@ class ShowEmployeesDistributionByTopics(Command):
             handle_exception_type=ServiceError,
             suppress_exception=True
         )
-        def operation() -> list[schema.Employee]:
-            return self.storage_service.get_employees(0, 999999999999)
+        def operation() -> dict[str, int]:
+            return get_statistics_window_reports(self.statistics_service, event_window).facets.topics
 
         event_window.perform_long_operation(
             operation,
@@ -624,15 +726,57 @@ class ShowEmployeesDistributionByTopicsDiagram(Command):
         self.diagrams_factory = diagrams_factory
 
     def __call__(self, event_window: "windows.AppWindow", values: dict[Key, Any]) -> None:
-        employees = values[events.StatisticsEvent.SHOW_EMPLOYEES_DISTRIBUTION_BY_TOPICS_DIAGRAM]
-        if employees is None:
+        emps_count_per_topic = values[events.StatisticsEvent.SHOW_EMPLOYEES_DISTRIBUTION_BY_TOPICS_DIAGRAM]
+        if emps_count_per_topic is None:
             return
 
-        diagram = self.diagrams_factory.create_employees_distribution_by_topics_diagram(employees)
+        diagram = self.diagrams_factory.create_employees_distribution_by_topics_diagram(emps_count_per_topic)
         diagram_window = event_window.parent_gui.create_diagram_window("Employees distribution by topics")
         diagram_window.draw_diagram(diagram)
 
 
+class ShowEmployeesTenureDistribution(Command):
+    def __init__(self, statistics_service: StatisticsService, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.statistics_service = statistics_service
+
+    def __call__(self, event_window: "windows.AppWindow", values: dict[Key, Any]) -> None:
+        if not isinstance(event_window, windows.StatisticsWindow):
+            return
+
+        @events.raise_status_events(
+            event_window,
+            events.OperationStatus.SUCCESS,
+            events.OperationStatus.PROCESSING,
+            events.OperationStatus.FAILED,
+            handle_exception_type=ServiceError,
+            suppress_exception=True
+        )
+        def operation() -> tuple[statistics_schema.TenureHistogram, statistics_schema.TenurePercentiles]:
+            reports = get_statistics_window_reports(self.statistics_service, event_window)
+            return reports.tenure_histogram, reports.tenure_percentiles
+
+        event_window.perform_long_operation(
+            operation,
+            events.StatisticsEvent.SHOW_EMPLOYEES_TENURE_DISTRIBUTION_DIAGRAM
+        )
+
+
+class ShowEmployeesTenureDistributionDiagram(Command):
+    def __init__(self, diagrams_factory: DiagramsFactory, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.diagrams_factory = diagrams_factory
+
+    def __call__(self, event_window: "windows.AppWindow", values: dict[Key, Any]) -> None:
+        tenure_distribution = values[events.StatisticsEvent.SHOW_EMPLOYEES_TENURE_DISTRIBUTION_DIAGRAM]
+        if tenure_distribution is None:
+            return
+
+        diagram = self.diagrams_factory.create_employees_tenure_distribution_diagram(*tenure_distribution)
+        diagram_window = event_window.parent_gui.create_diagram_window("Employees tenure distribution")
+        diagram_window.draw_diagram(diagram)
+
+
 class OpenForecastsWindow(Command):
     def __call__(self, event_window: "windows.AppWindow", values: dict[Key, Any]) -> None:
         gui = event_window.parent_gui
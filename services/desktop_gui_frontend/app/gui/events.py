@@ -26,6 +26,8 @@ class OperationStatus(Event):
 class EmployeeEvent(Event):
     REFRESH_EMPLOYEES_TABLE = "-REFRESH-EMPLOYEES-TABLE-"
     SHOW_EMPLOYEES = "-SHOW-EMPLOYEES-"
+    LOAD_MORE_EMPLOYEES = "-LOAD-MORE-EMPLOYEES-"
+    SHOW_MORE_EMPLOYEES = "-SHOW-MORE-EMPLOYEES-"
     EMPLOYEE_SELECTED = "-EMPLOYEE-SELECTED-"
 
     GET_EMPLOYEES = "-GET-EMPLOYEES-"
@@ -52,6 +54,9 @@ class StatisticsEvent(Event):
     SHOW_EMPLOYEES_DISTRIBUTION_BY_TOPICS = "-SHOW-EMPLOYEES-DISTRIBUTION-BY-TOPICS-"
     SHOW_EMPLOYEES_DISTRIBUTION_BY_TOPICS_DIAGRAM = "-SHOW-EMPLOYEES-DISTRIBUTION-BY-TOPICS-DIAGRAM-"
 
+    SHOW_EMPLOYEES_TENURE_DISTRIBUTION = "-SHOW-EMPLOYEES-TENURE-DISTRIBUTION-"
+    SHOW_EMPLOYEES_TENURE_DISTRIBUTION_DIAGRAM = "-SHOW-EMPLOYEES-TENURE-DISTRIBUTION-DIAGRAM-"
+
 
 class ForecastsEvent(Event):
     SHOW_TITLE_EMPLOYEES_GROWTH_FORECAST = "-SHOW-TITLE-EMPLOYEES-GROWTH-FORECAST-"
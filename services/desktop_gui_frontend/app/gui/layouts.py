@@ -42,6 +42,7 @@ MAIN_WINDOW_LAYOUT = [
      sg.Button("Update employee", key=EmployeeEvent.UPDATE_EMPLOYEE),
      sg.Button("Delete employee", key=EmployeeEvent.DELETE_EMPLOYEES),
      sg.Button("Search employee", key=EmployeeEvent.SEARCH_EMPLOYEES),
+     sg.Button("More employees", key=EmployeeEvent.LOAD_MORE_EMPLOYEES, disabled=True),
      sg.Button("Revert", key=EventsMisc.REVERT_ACTION),
      sg.Exit(key=WindowEvent.EXIT), sg.Text(key=ElementsMisc.OPERATION_STATUS_FIELD, visible=False)],
     [sg.Button("Statistics", key=WindowEvent.OPEN_STATISTICS_WINDOW),
@@ -59,6 +60,7 @@ STATISTICS_WINDOW_LAYOUT = [
      sg.Text("Title name:"), sg.Input(key=Statistics.TITLE_EMPLOYEES_GROWTH_HISTORY_TITLE_NAME)],
     [sg.Button("Employees distribution by titles", key=StatisticsEvent.SHOW_EMPLOYEES_DISTRIBUTION_BY_TITLES)],
     [sg.Button("Employees distribution by topics", key=StatisticsEvent.SHOW_EMPLOYEES_DISTRIBUTION_BY_TOPICS)],
+    [sg.Button("Employees tenure distribution", key=StatisticsEvent.SHOW_EMPLOYEES_TENURE_DISTRIBUTION)],
     [sg.Text(key=ElementsMisc.OPERATION_STATUS_FIELD, visible=False)],
     [sg.Text(key=ElementsMisc.OPERATION_STATUS_FIELD, visible=False)]
 ]
@@ -1,5 +1,5 @@
 import datetime
-from typing import Any, Iterable, Container
+from typing import Any, Iterable, Container, NamedTuple
 from abc import ABC, abstractmethod
 from copy import deepcopy
 
@@ -14,6 +14,7 @@ from ..service.storage.exceptions import WrongEmployeeData
 from ..service.exceptions import WrongData
 from ..service.mixins import Observer
 from ..service.storage import schema
+from ..service.statistics import schema as statistics_schema
 from ..service import ServiceFactory, StorageService
 from ..diagrams.diagrams import DiagramsFactory
 from .commands import history
@@ -92,10 +93,18 @@ class MainWindow(AppWindow, WindowWithOperationStatus, CanShowErrors, Observer):
     def __init__(self, observable_service: StorageService, *args: Any, **kwargs: Any) -> None:
         super().__init__("Database", layout=deepcopy(layouts.MAIN_WINDOW_LAYOUT), *args, **kwargs)
         self.table_employees: list[schema.Employee] = []
+        # Cursor of the next employees page, None if table has all employees
+        self.employees_next_cursor: str | None = None
         observable_service.attach_observer(self)
 
-    def update_employees_table(self, employees: list[schema.Employee]) -> None:
-        self.table_employees = employees
+    def update_employees_table(self, employees_page: schema.EmployeesPage) -> None:
+        self.table_employees = employees_page.employees
+        self.employees_next_cursor = employees_page.next_cursor
+        self.refresh_employees_table()
+
+    def extend_employees_table(self, employees_page: schema.EmployeesPage) -> None:
+        self.table_employees = self.table_employees + employees_page.employees
+        self.employees_next_cursor = employees_page.next_cursor
         self.refresh_employees_table()
 
     def refresh_employees_table(self) -> None:
@@ -116,6 +125,7 @@ class MainWindow(AppWindow, WindowWithOperationStatus, CanShowErrors, Observer):
             )
 
         self[events.EmployeeEvent.EMPLOYEE_SELECTED].update(values=table_rows)
+        self[events.EmployeeEvent.LOAD_MORE_EMPLOYEES].update(disabled=self.employees_next_cursor is None)
 
     def get_employee(self) -> schema.EmployeeIn:
         return schema.EmployeeIn(
@@ -145,6 +155,10 @@ class MainWindow(AppWindow, WindowWithOperationStatus, CanShowErrors, Observer):
             salary=self.get_salary_search_model()
         )
 
+        if model.name or model.surname or model.patronymic:
+            # Names are searched case-insensitively by prefix, so full capitalized names aren't required
+            model.name_match = "prefix"
+
         for i in model.dict().values():
             if i is not None:
                 return model
@@ -263,9 +277,26 @@ class MainWindow(AppWindow, WindowWithOperationStatus, CanShowErrors, Observer):
         self[events.EmployeeEvent.EMPLOYEE_SELECTED].update(select_rows=employees_list_ids)
 
 
-class StatisticsWindow(AppWindow, WindowWithOperationStatus, CanShowErrors):
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
+class StatisticsWindowReports(NamedTuple):
+    facets: statistics_schema.Facets
+    tenure_histogram: statistics_schema.TenureHistogram
+    tenure_percentiles: statistics_schema.TenurePercentiles
+
+
+class StatisticsWindow(AppWindow, WindowWithOperationStatus, CanShowErrors, Observer):
+    def __init__(self, observable_service: StorageService, *args: Any, **kwargs: Any) -> None:
         super().__init__("Statistics", layout=deepcopy(layouts.STATISTICS_WINDOW_LAYOUT), *args, **kwargs)
+        # Reports that need no input, fetched in one batch. None until some of them is shown or after employees change
+        self.reports: StatisticsWindowReports | None = None
+        self.observable_service = observable_service
+        observable_service.attach_observer(self)
+
+    def notify(self) -> None:
+        self.reports = None
+
+    def close(self) -> None:
+        self.observable_service.detach_observer(self)
+        super().close()
 
     def get_max_work_duration_employees_count(self) -> int:
         element = elements.Statistics.MAX_WORK_DURATION_EMPLOYEES_COUNT
@@ -319,10 +350,15 @@ class ForecastsWindow(AppWindow, WindowWithOperationStatus, CanShowErrors):
     def get_title_employees_growth_years_count(self) -> int:
         element = elements.Forecasts.TITLE_EMPLOYEES_GROWTH_FORECAST_YEARS_COUNT
         try:
-            return int(self[element].get())
+            years_count = int(self[element].get())
         except ValueError:
             raise WrongForecastsData(errors_places=[(element.value,)])
 
+        # Backend forecasts from 1 to 100 years
+        if not 1 <= years_count <= 100:
+            raise WrongForecastsData(errors_places=[(element.value,)])
+        return years_count
+
     def show_errors(self, exception: WrongData) -> None:
         if isinstance(exception, WrongForecastsData):
             errors_fields = get_wrong_forecasts_data_fields(exception)
@@ -370,6 +406,10 @@ class WindowsFactory:
                 commands.RefreshEmployeesTable(self.storage_service, commands_history),
             events.EmployeeEvent.SHOW_EMPLOYEES:
                 commands.ShowEmployees(commands_history),
+            events.EmployeeEvent.LOAD_MORE_EMPLOYEES:
+                commands.LoadMoreEmployees(self.storage_service, commands_history),
+            events.EmployeeEvent.SHOW_MORE_EMPLOYEES:
+                commands.ShowMoreEmployees(commands_history),
             events.EmployeeEvent.ADD_EMPLOYEE:
                 commands.MultiCommand(
                     commands.HideErrors(commands_history),
@@ -460,7 +500,7 @@ class WindowsFactory:
             events.StatisticsEvent.SHOW_EMPLOYEES_DISTRIBUTION_BY_TITLES:
                 commands.MultiCommand(
                     commands.HideErrors(commands_history),
-                    commands.ShowEmployeesDistributionByTitles(self.storage_service, commands_history),
+                    commands.ShowEmployeesDistributionByTitles(self.statistics_service, commands_history),
                     commands_history=commands_history
                 ),
             events.StatisticsEvent.SHOW_EMPLOYEES_DISTRIBUTION_BY_TITLES_DIAGRAM:
@@ -468,11 +508,19 @@ class WindowsFactory:
             events.StatisticsEvent.SHOW_EMPLOYEES_DISTRIBUTION_BY_TOPICS:
                 commands.MultiCommand(
                     commands.HideErrors(commands_history),
-                    commands.ShowEmployeesDistributionByTopics(self.storage_service, commands_history),
+                    commands.ShowEmployeesDistributionByTopics(self.statistics_service, commands_history),
                     commands_history=commands_history
                 ),
             events.StatisticsEvent.SHOW_EMPLOYEES_DISTRIBUTION_BY_TOPICS_DIAGRAM:
                 commands.ShowEmployeesDistributionByTopicsDiagram(self.diagrams_factory, commands_history),
+            events.StatisticsEvent.SHOW_EMPLOYEES_TENURE_DISTRIBUTION:
+                commands.MultiCommand(
+                    commands.HideErrors(commands_history),
+                    commands.ShowEmployeesTenureDistribution(self.statistics_service, commands_history),
+                    commands_history=commands_history
+                ),
+            events.StatisticsEvent.SHOW_EMPLOYEES_TENURE_DISTRIBUTION_DIAGRAM:
+                commands.ShowEmployeesTenureDistributionDiagram(self.diagrams_factory, commands_history),
             events.OperationStatus.SUCCESS:
                 commands.ShowStatus(events.OperationStatus.SUCCESS, commands_history),
             events.OperationStatus.PROCESSING:
@@ -487,6 +535,7 @@ class WindowsFactory:
         }
         return StatisticsWindow(
             parent_gui=parent_gui,
+            observable_service=self.storage_service,
             events_handlers=statistics_window_events_handlers,
             location=(400, 800),
             size=(800, 300),
@@ -0,0 +1,60 @@
+import json
+import threading
+from collections import OrderedDict
+from typing import Any
+
+import requests
+
+
+class ConditionalRequests:
+    """
+    Sends requests with If-None-Match of previous response to same request,
+    and returns previous response if backend answers 304 Not Modified
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self._responses: OrderedDict[tuple[str, str, str, str], requests.Response] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str, params: dict[str, Any] | None = None) -> requests.Response:
+        return self.request("GET", url, params=params)
+
+    def post(self, url: str, params: dict[str, Any] | None = None, json: Any = None) -> requests.Response:
+        return self.request("POST", url, params=params, json=json)
+
+    def request(
+            self,
+            method: str,
+            url: str,
+            params: dict[str, Any] | None = None,
+            json: Any = None
+    ) -> requests.Response:
+        key = (method, url, self._dumps(params), self._dumps(json))
+        with self._lock:
+            cached_response = self._responses.get(key)
+
+        headers = {}
+        if cached_response is not None:
+            headers["If-None-Match"] = cached_response.headers["ETag"]
+
+        response = requests.request(method, url, params=params, json=json, headers=headers)
+
+        with self._lock:
+            if response.status_code == requests.codes.not_modified and cached_response is not None:
+                self._responses.move_to_end(key)
+                return cached_response
+
+            if response.ok and "ETag" in response.headers:
+                self._responses[key] = response
+                self._responses.move_to_end(key)
+                while len(self._responses) > self.maxsize:
+                    self._responses.popitem(last=False)
+            else:
+                self._responses.pop(key, None)
+
+        return response
+
+    @staticmethod
+    def _dumps(value: Any) -> str:
+        return json.dumps(value, sort_keys=True, default=str)
@@ -1,19 +1,27 @@
 import requests
 
 from ..exceptions import BackendConnectionError, BackendServerError
-from .service import ForecastsImp
+from ..conditional_requests import ConditionalRequests
+from .service import ForecastsImp, ForecastModel, ForecastDimension
 
 
 class ForecastsBackend(ForecastsImp):
     def __init__(self, backend_url: str) -> None:
         self.backend_url = backend_url
+        self.conditional_requests = ConditionalRequests()
 
-    def get_title_employees_forecast_growth(self, title_name: str, years_count: int) -> dict[int, int]:
+    def get_title_employees_forecast_growth(
+            self,
+            title_name: str,
+            years_count: int,
+            model: ForecastModel = "moving_average"
+    ) -> dict[int, int]:
         endpoint_url = rf"{self.backend_url}/forecasts/title_employees_growth/{years_count}"
 
         try:
-            response = requests.post(
+            response = self.conditional_requests.post(
                 endpoint_url,
+                params={"model": model},
                 json={"name": title_name}
             )
         except requests.exceptions.ConnectionError as err:
@@ -30,3 +38,31 @@ class ForecastsBackend(ForecastsImp):
             return {int(k): v for k, v in response.json().items()}
         else:
             return {}
+
+    def get_employees_forecast_growth(
+            self,
+            dimension: ForecastDimension,
+            years_count: int,
+            model: ForecastModel = "moving_average"
+    ) -> dict[str, dict[int, int]]:
+        endpoint_url = rf"{self.backend_url}/forecasts/employees_growth/{dimension}/{years_count}"
+
+        try:
+            response = self.conditional_requests.get(endpoint_url, params={"model": model})
+        except requests.exceptions.ConnectionError as err:
+            raise BackendConnectionError from err
+
+        if response.status_code >= 500:
+            raise BackendServerError
+
+        if __debug__:
+            print(f"Status code: {response.status_code}")
+            print(response.json())
+
+        if response.ok:
+            return {
+                name: {int(year): count for year, count in forecast.items()}
+                for name, forecast in response.json().items()
+            }
+        else:
+            return {}
@@ -1,11 +1,30 @@
 from abc import ABC, abstractmethod
+from typing import Literal
 
 from app.service.exceptions import BackendConnectionError
 
 
+ForecastModel = Literal["moving_average", "linear_trend", "exponential_smoothing"]
+ForecastDimension = Literal["title", "topic", "department"]
+
+
 class ForecastsImp(ABC):
     @abstractmethod
-    def get_title_employees_forecast_growth(self, title_name: str, years_count: int) -> dict[int, int]:
+    def get_title_employees_forecast_growth(
+            self,
+            title_name: str,
+            years_count: int,
+            model: ForecastModel = "moving_average"
+    ) -> dict[int, int]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_employees_forecast_growth(
+            self,
+            dimension: ForecastDimension,
+            years_count: int,
+            model: ForecastModel = "moving_average"
+    ) -> dict[str, dict[int, int]]:
         raise NotImplementedError
 
 
@@ -13,8 +32,24 @@ class ForecastsService:
     def __init__(self, implementation: ForecastsImp) -> None:
         self.implementation = implementation
 
-    def get_title_employees_forecast_growth(self, title_name: str, years_count: int) -> dict[int, int]:
+    def get_title_employees_forecast_growth(
+            self,
+            title_name: str,
+            years_count: int,
+            model: ForecastModel = "moving_average"
+    ) -> dict[int, int]:
+        try:
+            return self.implementation.get_title_employees_forecast_growth(title_name, years_count, model)
+        except BackendConnectionError:
+            raise
+
+    def get_employees_forecast_growth(
+            self,
+            dimension: ForecastDimension,
+            years_count: int,
+            model: ForecastModel = "moving_average"
+    ) -> dict[str, dict[int, int]]:
         try:
-            return self.implementation.get_title_employees_forecast_growth(title_name, years_count)
+            return self.implementation.get_employees_forecast_growth(dimension, years_count, model)
         except BackendConnectionError:
             raise
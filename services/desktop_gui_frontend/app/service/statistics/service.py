@@ -1,20 +1,12 @@
 from abc import ABC, abstractmethod
 
 from app.service.exceptions import BackendConnectionError
-from app.service.storage import schema
+from app.service.statistics import schema as statistics_schema
 
 
 class StatisticsImp(ABC):
     @abstractmethod
-    def get_title_employees_history_growth(self, title_name: str) -> dict[int, int]:
-        raise NotImplementedError
-
-    @abstractmethod
-    def get_max_work_duration_employees(self, employees_count: int) -> list[schema.Employee]:
-        raise NotImplementedError
-
-    @abstractmethod
-    def get_highest_paid_employees(self, employees_count: int) -> list[schema.Employee]:
+    def get_statistics_batch(self, reports: list[statistics_schema.ReportIn]) -> statistics_schema.StatisticsBatch:
         raise NotImplementedError
 
 
@@ -22,20 +14,8 @@ class StatisticsService:
     def __init__(self, implementation: StatisticsImp) -> None:
         self.implementation = implementation
 
-    def get_title_employees_history_growth(self, title_name: str) -> dict[int, int]:
-        try:
-            return self.implementation.get_title_employees_history_growth(title_name)
-        except BackendConnectionError:
-            raise
-
-    def get_max_work_duration_employees(self, employees_count: int) -> list[schema.Employee]:
-        try:
-            return self.implementation.get_max_work_duration_employees(employees_count)
-        except BackendConnectionError:
-            raise
-
-    def get_highest_paid_employees(self, employees_count: int) -> list[schema.Employee]:
+    def get_statistics_batch(self, reports: list[statistics_schema.ReportIn]) -> statistics_schema.StatisticsBatch:
         try:
-            return self.implementation.get_highest_paid_employees(employees_count)
+            return self.implementation.get_statistics_batch(reports)
         except BackendConnectionError:
             raise
@@ -7,11 +7,13 @@ from . import schema
 from .service import StorageImp
 from .exceptions import WrongEmployeeData
 from ..exceptions import BackendConnectionError, BackendServerError
+from ..conditional_requests import ConditionalRequests
 
 
 class StorageBackend(StorageImp):
     def __init__(self, backend_url: str) -> None:
         self.backend_url = backend_url
+        self.conditional_requests = ConditionalRequests()
 
     def add_employee(self, employee: schema.EmployeeIn) -> schema.Employee:
         endpoint_url = rf"{self.backend_url}/storage/employee"
@@ -48,16 +50,17 @@ class StorageBackend(StorageImp):
 
         return schema.Employee.parse_obj(response.json())
 
-    def get_employees(self, skip: int, limit: int) -> list[schema.Employee]:
-        endpoint_url = rf"{self.backend_url}/storage/employees"
+    def get_employees(self, limit: int, cursor: str | None = None) -> schema.EmployeesPage:
+        endpoint_url = rf"{self.backend_url}/storage/employees/page"
 
-        params = {
-            "skip": skip,
+        params: dict[str, str | int] = {
             "limit": limit
         }
+        if cursor is not None:
+            params["cursor"] = cursor
 
         try:
-            response = requests.get(url=endpoint_url, params=params)
+            response = self.conditional_requests.get(endpoint_url, params=params)
         except requests.exceptions.ConnectionError as err:
             raise BackendConnectionError from err
 
@@ -68,8 +71,7 @@ class StorageBackend(StorageImp):
             print(f"Status code: {response.status_code}")
             print(response.json())
 
-        employees = [schema.Employee.parse_obj(i) for i in response.json()]
-        return employees
+        return schema.EmployeesPage.parse_obj(response.json())
 
     def update_employee(self, employee: schema.EmployeeIn, employee_id: int) -> schema.Employee:
         endpoint_url = rf"{self.backend_url}/storage/employee/{employee_id}"
@@ -105,35 +107,44 @@ class StorageBackend(StorageImp):
 
         return schema.Employee.parse_obj(response.json())
 
-    def delete_employees(self, employees_ids: list[int]) -> list[schema.Employee]:
-        endpoint_url = rf"{self.backend_url}/storage/employee"
+    def delete_employees(self, employees_ids: list[int]) -> list[int]:
+        endpoint_url = rf"{self.backend_url}/storage/employees"
 
         try:
-            employees = []
-            for id_ in employees_ids:
-                response = requests.delete(url=rf"{endpoint_url}/{id_}",)
+            response = requests.delete(
+                url=endpoint_url,
+                json=employees_ids,
+            )
+        except requests.exceptions.ConnectionError as err:
+            raise BackendConnectionError from err
 
-                if response.status_code >= 500:
-                    raise BackendServerError
+        if response.status_code >= 500:
+            raise BackendServerError
 
-                if __debug__:
-                    print(f"Status code: {response.status_code}")
-                    print(response.json())
+        if __debug__:
+            print(f"Status code: {response.status_code}")
+            print(response.json())
 
-                employee = schema.Employee.parse_obj(response.json())
-                employees.append(employee)
+        return [int(i) for i in response.json()]
 
-            return employees
+    def search_employees(
+            self,
+            employee_search_model: schema.EmployeeSearchModel,
+            limit: int,
+            cursor: str | None = None
+    ) -> schema.EmployeesSearchPage:
+        endpoint_url = rf"{self.backend_url}/storage/search/employees"
 
-        except requests.exceptions.ConnectionError as err:
-            raise BackendConnectionError from err
+        params: dict[str, str | int] = {
+            "limit": limit
+        }
+        if cursor is not None:
+            params["cursor"] = cursor
 
-    def search_employees(self, employee_search_model: schema.EmployeeSearchModel) -> list[schema.Employee]:
-        endpoint_url = rf"{self.backend_url}/storage/search/employees"
-        print(employee_search_model.dict(exclude_none=True))
         try:
-            response = requests.post(
+            response = self.conditional_requests.post(
                 endpoint_url,
+                params=params,
                 json=employee_search_model.dict(exclude_none=True)
             )
         except requests.exceptions.ConnectionError as err:
@@ -159,4 +170,4 @@ class StorageBackend(StorageImp):
 
             raise WrongEmployeeData(errors_places, messages, errors_types)
 
-        return [schema.Employee.parse_obj(i) for i in response.json()]
+        return schema.EmployeesSearchPage.parse_obj(response.json())
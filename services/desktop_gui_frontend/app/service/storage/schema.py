@@ -139,6 +139,15 @@ class EmployeeOut(EmployeeBase):
     titles: list[TitleOut]
 
 
+class EmployeesPage(Base):
+    employees: list[Employee]
+    next_cursor: str | None
+
+
+class EmployeesSearchPage(EmployeesPage):
+    total_count: int | None
+
+
 class TopicSearchModel(Base):
     name: str | None = None
     number: str | None = None
@@ -155,6 +164,8 @@ class CurrencySearchModel(Base):
 
 class SalarySearchModel(Base):
     amount: str | None = None
+    amount_min: str | None = None
+    amount_max: str | None = None
     currency: CurrencySearchModel | None = None
 
 
@@ -166,9 +177,12 @@ class EmployeeSearchModel(Base):
     name: str | None = None
     surname: str | None = None
     patronymic: str | None = None
+    name_match: str | None = None
     service_number: str | None = None
     department_number: str | None = None
     employment_date: str | None = None
+    employment_date_min: str | None = None
+    employment_date_max: str | None = None
     topic: TopicSearchModel | None = None
     post: PostSearchModel | None = None
     salary: SalarySearchModel | None = None
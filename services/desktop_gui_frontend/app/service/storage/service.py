@@ -11,7 +11,7 @@ class StorageImp(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def get_employees(self, skip: int, limit: int) -> list[schema.Employee]:
+    def get_employees(self, limit: int, cursor: str | None = None) -> schema.EmployeesPage:
         raise NotImplementedError
 
     @abstractmethod
@@ -19,11 +19,16 @@ class StorageImp(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def delete_employees(self, employees_ids: list[int]) -> list[schema.Employee]:
+    def delete_employees(self, employees_ids: list[int]) -> list[int]:
         raise NotImplementedError
 
     @abstractmethod
-    def search_employees(self, search_model: schema.EmployeeSearchModel) -> list[schema.Employee]:
+    def search_employees(
+            self,
+            search_model: schema.EmployeeSearchModel,
+            limit: int,
+            cursor: str | None = None
+    ) -> schema.EmployeesSearchPage:
         raise NotImplementedError
 
 
@@ -37,19 +42,40 @@ class StorageService(mixins.ObservableMixin):
         self.notify_observers()
         return employee
 
-    def get_employees(self, skip: int, limit: int) -> list[schema.Employee]:
-        employees = self.implementation.get_employees(skip, limit)
-        return employees
+    def get_employees(self, limit: int, cursor: str | None = None) -> schema.EmployeesPage:
+        employees_page = self.implementation.get_employees(limit, cursor)
+        return employees_page
 
     def update_employee(self, employee_in: schema.EmployeeIn, employee_id: int) -> schema.Employee:
         employee = self.implementation.update_employee(employee_in, employee_id)
         self.notify_observers()
         return employee
 
-    def delete_employees(self, employees_ids: list[int]) -> list[schema.Employee]:
-        employees = self.implementation.delete_employees(employees_ids)
+    def delete_employees(self, employees_ids: list[int]) -> list[int]:
+        deleted_employees_ids = self.implementation.delete_employees(employees_ids)
         self.notify_observers()
-        return employees
+        return deleted_employees_ids
 
-    def search_employees(self, employee_search_model: schema.EmployeeSearchModel) -> list[schema.Employee]:
-        return self.implementation.search_employees(employee_search_model)
+    def search_employees(
+            self,
+            employee_search_model: schema.EmployeeSearchModel,
+            limit: int,
+            cursor: str | None = None
+    ) -> schema.EmployeesSearchPage:
+        return self.implementation.search_employees(employee_search_model, limit, cursor)
+
+    def search_all_employees(
+            self,
+            employee_search_model: schema.EmployeeSearchModel,
+            page_size: int = 1000
+    ) -> list[schema.Employee]:
+        employees_page = self.implementation.search_employees(employee_search_model, page_size)
+        employees = employees_page.employees
+        while employees_page.next_cursor is not None:
+            employees_page = self.implementation.search_employees(
+                employee_search_model,
+                page_size,
+                employees_page.next_cursor
+            )
+            employees.extend(employees_page.employees)
+        return employees